@@ -5,6 +5,18 @@ from .base_parser import BaseParser
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+# Operadores de comparación de HAVING y sus claves ordenadas de mayor a menor longitud
+_HAVING_OPERATORS = {
+    ">=": "$gte",
+    "<=": "$lte",
+    "<>": "$ne",
+    "!=": "$ne",
+    "=": "$eq",
+    ">": "$gt",
+    "<": "$lt"
+}
+_HAVING_OPERATORS_SORTED = tuple(sorted(_HAVING_OPERATORS, key=len, reverse=True))
+
 class AdvancedParser(BaseParser):
     """
     Parser especializado para funcionalidades SQL avanzadas.
@@ -33,12 +45,7 @@ class AdvancedParser(BaseParser):
         Returns:
             dict: Diccionario con funcionalidades avanzadas encontradas
         """
-        result = {
-            'has_distinct': self.has_distinct(query_or_clause),
-            'has_having': self.has_having(query_or_clause),
-            'has_union': self.has_union(query_or_clause),
-            'has_subquery': self.has_subquery(query_or_clause)
-        }
+        result = self.analyze(query_or_clause)
         
         if result['has_distinct']:
             result['distinct_info'] = self.parse_distinct(query_or_clause)
@@ -54,6 +61,27 @@ class AdvancedParser(BaseParser):
         
         return result
     
+    def analyze(self, query, query_upper=None):
+        """
+        Calcula todas las banderas de funcionalidades avanzadas en una sola llamada.
+        Cada patrón solo se evalúa si su palabra clave aparece en la consulta.
+        
+        Args:
+            query (str): Consulta SQL a analizar
+            query_upper (str, optional): La consulta ya pasada a mayúsculas
+            
+        Returns:
+            dict: Banderas has_distinct, has_having, has_union y has_subquery
+        """
+        if query_upper is None:
+            query_upper = query.upper()
+        return {
+            'has_distinct': 'DISTINCT' in query_upper and self.has_distinct(query),
+            'has_having': 'HAVING' in query_upper and self.has_having(query),
+            'has_union': 'UNION' in query_upper and self.has_union(query),
+            'has_subquery': '(' in query and 'SELECT' in query_upper and self.has_subquery(query)
+        }
+    
     # =================== DISTINCT ===================
     
     def has_distinct(self, query):
@@ -242,19 +270,8 @@ class AdvancedParser(BaseParser):
         """
         result = {}
         
-        # Operadores de comparación
-        operators = {
-            ">=": "$gte",
-            "<=": "$lte", 
-            "<>": "$ne",
-            "!=": "$ne",
-            "=": "$eq",
-            ">": "$gt",
-            "<": "$lt"
-        }
-        
-        # Buscar operadores de comparación
-        for op in sorted(operators.keys(), key=len, reverse=True):
+        # Buscar operadores de comparación (los de dos caracteres primero)
+        for op in _HAVING_OPERATORS_SORTED:
             if op in condition_str:
                 parts = condition_str.split(op, 1)
                 if len(parts) == 2:
@@ -268,7 +285,7 @@ class AdvancedParser(BaseParser):
                     if op == "=":
                         result[field_name] = value
                     else:
-                        result[field_name] = {operators[op]: value}
+                        result[field_name] = {_HAVING_OPERATORS[op]: value}
                     
                     break
         
@@ -565,51 +582,84 @@ class AdvancedParser(BaseParser):
     
     def _has_top_level_operator(self, text, operator):
         """Verifica operadores a nivel superior (fuera de paréntesis)."""
-        pattern = r'\s' + operator + r'\s'
+        # Mayúsculas una sola vez; en el bucle solo se comparan caracteres
+        operator = operator.upper()
+        text_up = self._upper_aligned(text)
+        size = len(operator)
         level = 0
         
-        for i in range(len(text) - len(operator)):
-            if text[i] == '(':
+        for i in range(len(text) - size - 1):
+            char = text[i]
+            if char == '(':
                 level += 1
-            elif text[i] == ')':
+            elif char == ')':
                 level -= 1
-            elif level == 0 and re.match(pattern, text[i:i+len(operator)+2], re.IGNORECASE):
+            elif level == 0 and self._is_operator_at(text, text_up, i, operator):
                 return True
         
         return False
     
+    def _upper_aligned(self, text):
+        """
+        Devuelve text.upper() si conserva la longitud del texto, o None si no.
+        upper() puede alargar algunos caracteres Unicode (ß -> SS) y entonces
+        sus posiciones ya no coinciden con las de text.
+        """
+        text_up = text.upper()
+        return text_up if len(text_up) == len(text) else None
+    
+    def _is_operator_at(self, text, text_up, i, operator):
+        """
+        Verifica si en la posición i empieza " OPERADOR " (con cualquier espacio).
+        
+        Args:
+            text (str): Texto original
+            text_up (str): Texto en mayúsculas alineado con text, o None
+            i (int): Posición del espacio previo al operador
+            operator (str): Operador en mayúsculas
+            
+        Returns:
+            bool: True si el operador aparece en esa posición
+        """
+        size = len(operator)
+        if not text[i].isspace() or not text[i + size + 1].isspace():
+            return False
+        if text_up is not None:
+            return text_up.startswith(operator, i + 1)
+        # Sin mayúsculas alineadas: comparar solo el fragmento del operador
+        return text[i + 1:i + 1 + size].upper() == operator
+    
     def _split_by_top_level_operator(self, text, operator):
         """Divide texto por operador a nivel superior."""
         result = []
-        current = ""
+        operator = operator.upper()
+        size = len(operator)
         level = 0
+        start = 0
         i = 0
         
-        op_pattern = r'\s' + operator + r'\s'
         text = " " + text + " "
+        text_up = self._upper_aligned(text)
+        end = len(text) - size - 1
         
-        while i < len(text):
-            if text[i] == '(':
+        while i < end:
+            char = text[i]
+            if char == '(':
                 level += 1
-                current += text[i]
-            elif text[i] == ')':
+            elif char == ')':
                 level -= 1
-                current += text[i]
-            elif level == 0 and i <= len(text) - len(operator) - 2:
-                part = text[i:i+len(operator)+2]
-                if re.match(op_pattern, part, re.IGNORECASE):
-                    if current.strip():
-                        result.append(current.strip())
-                    current = ""
-                    i += len(operator)
-                else:
-                    current += text[i]
-            else:
-                current += text[i]
+            elif level == 0 and self._is_operator_at(text, text_up, i, operator):
+                # Guardar la parte anterior al operador (por cortes, sin concatenar carácter a carácter)
+                part = text[start:i].strip()
+                if part:
+                    result.append(part)
+                start = i + size + 1
+                i += size
             i += 1
         
-        if current.strip():
-            result.append(current.strip())
+        part = text[start:].strip()
+        if part:
+            result.append(part)
         
         return result
     
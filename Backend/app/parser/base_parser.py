@@ -6,6 +6,10 @@ class BaseParser(ABC):
     Define la interfaz común que deben implementar todos los parsers específicos.
     """
     
+    # Sin atributos de instancia: las subclases sin estado pueden declarar
+    # __slots__ vacío y evitar el __dict__ por instancia
+    __slots__ = ()
+    
     @abstractmethod
     def parse(self, query_or_clause):
         """
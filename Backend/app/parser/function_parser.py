@@ -80,6 +80,13 @@ class FunctionParser(BaseParser):
             **self.string_functions, 
             **self.math_functions
         }
+        
+        # Patrón único para detectar una llamada a cualquiera de las funciones
+        # (los nombres más largos primero para que LOG10 no quede como LOG)
+        function_names = sorted(self.all_functions, key=len, reverse=True)
+        self.function_call_pattern = re.compile(
+            r'\b(?:' + '|'.join(function_names) + r')\s*\(', re.IGNORECASE
+        )
     
     def parse(self, query_or_clause):
         """
@@ -103,17 +110,28 @@ class FunctionParser(BaseParser):
         Returns:
             bool: True si contiene funciones, False en caso contrario
         """
-        query_upper = query.upper()
-        
-        # Buscar patrones de funciones con paréntesis
-        for func_name in self.all_functions.keys():
-            pattern = rf'\b{func_name}\s*\('
-            if re.search(pattern, query_upper):
-                logger.debug(f"Función detectada: {func_name}")
-                return True
+        # Buscar cualquier función seguida de paréntesis en una sola pasada
+        match = self.function_call_pattern.search(query)
+        if match:
+            logger.debug("Función detectada: %s", match.group())
+            return True
         
         return False
     
+    def analyze(self, query, query_upper=None):
+        """
+        Calcula las banderas de funciones de una consulta en una sola llamada.
+        
+        Args:
+            query (str): Consulta SQL a analizar
+            query_upper (str, optional): La consulta ya pasada a mayúsculas (no se necesita aquí)
+            
+        Returns:
+            dict: Diccionario con la bandera has_functions
+        """
+        # Sin paréntesis no puede haber llamadas a funciones
+        return {'has_functions': '(' in query and self.has_functions(query)}
+    
     def parse_functions(self, query):
         """
         Extrae y analiza todas las funciones de una consulta SQL.
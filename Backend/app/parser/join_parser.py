@@ -1,16 +1,33 @@
 import re
 import logging
+from functools import lru_cache
 from .base_parser import BaseParser
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+# Caracteres de quoting que pueden rodear un nombre de tabla
+_QUOTE_CHARS = "`[]\"'"
+
+
+@lru_cache(maxsize=1024)
+def _explain(join_type, table, left_table, left_field, right_table, right_field):
+    """Texto explicativo de un JOIN por igualdad (memoizado para consultas repetidas)."""
+    return f"{join_type} JOIN with {table} on {left_table}.{left_field} = {right_table}.{right_field}"
+
+
 class JoinParser(BaseParser):
     """
     Parser especializado para operaciones JOIN de SQL.
     Convierte JOINs a pipelines de agregación MongoDB usando $lookup.
     """
     
+    # Tipos de JOIN que requieren manejo especial en MongoDB
+    _RIGHT_FULL_SET = frozenset(('right', 'full'))
+    
+    # Prototipo de la etapa $lookup; se copia y solo se asignan los campos variables
+    _LOOKUP_PROTO = {"$lookup": {"from": None, "localField": None, "foreignField": None, "as": None}}
+    
     def __init__(self):
         """Inicializar el parser con patrones y configuraciones."""
         
@@ -51,6 +68,21 @@ class JoinParser(BaseParser):
             'requires_lookup': len(joins) > 0
         }
     
+    def analyze(self, query, query_upper=None):
+        """
+        Calcula las banderas de JOIN de una consulta en una sola llamada.
+        
+        Args:
+            query (str): Consulta SQL a analizar
+            query_upper (str, optional): La consulta ya pasada a mayúsculas
+            
+        Returns:
+            dict: Diccionario con la bandera has_joins
+        """
+        if query_upper is None:
+            query_upper = query.upper()
+        return {'has_joins': 'JOIN' in query_upper and self.has_joins(query)}
+    
     def has_joins(self, query):
         """
         Verifica si una consulta contiene operaciones JOIN.
@@ -99,13 +131,13 @@ class JoinParser(BaseParser):
         Returns:
             dict: Información detallada del JOIN
         """
-        join_type_str = match.group('join_type').strip()
-        table = match.group('table').strip()
-        alias = match.group('alias')
-        condition = match.group('condition').strip()
+        join_type_str, table, alias, condition = match.group('join_type', 'table', 'alias', 'condition')
+        join_type_str = join_type_str.strip()
+        table = table.strip()
+        condition = condition.strip()
         
         # Limpiar nombre de tabla
-        clean_table = table.strip('`[]"\'')
+        clean_table = table.strip(_QUOTE_CHARS)
         
         # Determinar tipo de JOIN
         join_type = self._determine_join_type(join_type_str)
@@ -116,6 +148,7 @@ class JoinParser(BaseParser):
         join_info = {
             'index': index,
             'type': join_type,
+            'type_upper': join_type.upper(),
             'table': clean_table,
             'alias': alias if alias else clean_table,
             'condition': join_condition,
@@ -156,15 +189,12 @@ class JoinParser(BaseParser):
         Returns:
             dict: Información de la condición parseada
         """
-        # Patrón básico: tabla1.campo = tabla2.campo
+        # Patrón básico: tabla1.campo = tabla2.campo (también cubre alias.campo = tabla.campo)
         basic_pattern = r'(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)'
         match = re.search(basic_pattern, condition, re.IGNORECASE)
         
         if match:
-            left_table = match.group(1)
-            left_field = match.group(2)
-            right_table = match.group(3)
-            right_field = match.group(4)
+            left_table, left_field, right_table, right_field = match.groups()
             
             return {
                 'type': 'equality',
@@ -175,20 +205,6 @@ class JoinParser(BaseParser):
                 'operator': '='
             }
         
-        # Patrón con alias: alias.campo = tabla.campo
-        alias_pattern = r'(\w+)\.(\w+)\s*=\s*(\w+)\.(\w+)'
-        match = re.search(alias_pattern, condition, re.IGNORECASE)
-        
-        if match:
-            return {
-                'type': 'equality',
-                'left_table': match.group(1),
-                'left_field': match.group(2),
-                'right_table': match.group(3),
-                'right_field': match.group(4),
-                'operator': '='
-            }
-        
         # Si no se puede parsear, devolver información básica
         return {
             'type': 'complex',
@@ -216,13 +232,14 @@ class JoinParser(BaseParser):
         
         return strategies.get(join_type, 'lookup_with_match')
     
-    def translate_joins_to_mongodb(self, query, joins_info=None):
+    def translate_joins_to_mongodb(self, query, joins_info=None, optimize=False):
         """
         Traduce JOINs a pipeline de agregación MongoDB.
         
         Args:
             query (str): Consulta SQL original
             joins_info (list): Información de JOINs (opcional)
+            optimize (bool): Agregar sugerencias de índice a cada $lookup al crearlo
             
         Returns:
             list: Pipeline de agregación MongoDB
@@ -237,18 +254,19 @@ class JoinParser(BaseParser):
         
         # Procesar cada JOIN secuencialmente
         for join in joins_info:
-            join_stages = self._create_lookup_stages(join)
+            join_stages = self._create_lookup_stages(join, optimize)
             pipeline.extend(join_stages)
         
         logger.info(f"Pipeline de JOINs generado con {len(pipeline)} etapas")
         return pipeline
     
-    def _create_lookup_stages(self, join_info):
+    def _create_lookup_stages(self, join_info, optimize=False):
         """
         Crea las etapas de $lookup para un JOIN específico.
         
         Args:
             join_info (dict): Información del JOIN
+            optimize (bool): Agregar sugerencia de índice al $lookup
             
         Returns:
             list: Lista de etapas del pipeline
@@ -261,24 +279,24 @@ class JoinParser(BaseParser):
             logger.warning(f"Condición de JOIN compleja no completamente soportada: {condition}")
             return []
         
-        # Crear etapa $lookup básica
-        lookup_stage = {
-            "$lookup": {
-                "from": join_info['table'],
-                "localField": condition['left_field'],
-                "foreignField": condition['right_field'],
-                "as": join_info['alias'] + "_joined"
-            }
-        }
+        # Crear etapa $lookup básica a partir del prototipo
+        joined_as = join_info['alias'] + "_joined"
+        lookup = self._LOOKUP_PROTO["$lookup"].copy()
+        lookup["from"] = join_info['table']
+        lookup["localField"] = condition['left_field']
+        lookup["foreignField"] = condition['right_field']
+        lookup["as"] = joined_as
+        if optimize:
+            lookup["_index_hint"] = self._index_hint(lookup)
         
-        stages.append(lookup_stage)
+        stages.append({"$lookup": lookup})
         
         # Agregar etapas específicas según el tipo de JOIN
         if join_type == 'inner':
             # INNER JOIN: filtrar documentos sin matches
             match_stage = {
                 "$match": {
-                    join_info['alias'] + "_joined": {"$ne": []}
+                    joined_as: {"$ne": []}
                 }
             }
             stages.append(match_stage)
@@ -301,7 +319,7 @@ class JoinParser(BaseParser):
         if join_type in ['inner', 'left']:
             unwind_stage = {
                 "$unwind": {
-                    "path": "$" + join_info['alias'] + "_joined",
+                    "path": "$" + joined_as,
                     "preserveNullAndEmptyArrays": join_type == 'left'
                 }
             }
@@ -325,7 +343,7 @@ class JoinParser(BaseParser):
         match = re.search(from_pattern, query, re.IGNORECASE)
         
         if match:
-            table = match.group(1).strip('`[]"\'')
+            table = match.group(1).strip(_QUOTE_CHARS)
             alias = match.group(2) if match.group(2) else table
             
             return {
@@ -340,24 +358,36 @@ class JoinParser(BaseParser):
         """
         Optimiza el pipeline de JOINs para mejor rendimiento.
         
+        Se mantiene por compatibilidad con pipelines ya construidos; las etapas
+        se modifican en el lugar. Para pipelines nuevos es preferible usar
+        translate_joins_to_mongodb(..., optimize=True).
+        
         Args:
             pipeline (list): Pipeline de agregación
             
         Returns:
-            list: Pipeline optimizado
+            list: Pipeline optimizado (el mismo objeto recibido)
         """
-        optimized = []
-        
         for stage in pipeline:
             # Optimización 1: Agregar hint sobre índices
             if "$lookup" in stage:
                 lookup = stage["$lookup"]
                 # Sugerir índice en el campo de lookup
-                lookup["_index_hint"] = f"Consider index on {lookup['from']}.{lookup['foreignField']}"
-            
-            optimized.append(stage)
+                lookup["_index_hint"] = self._index_hint(lookup)
+        
+        return pipeline
+    
+    def _index_hint(self, lookup):
+        """
+        Genera la sugerencia de índice para una etapa $lookup.
         
-        return optimized
+        Args:
+            lookup (dict): Cuerpo de la etapa $lookup
+            
+        Returns:
+            str: Sugerencia de índice
+        """
+        return f"Consider index on {lookup['from']}.{lookup['foreignField']}"
     
     def generate_join_explanation(self, joins_info):
         """
@@ -372,12 +402,14 @@ class JoinParser(BaseParser):
         explanations = []
         
         for join in joins_info:
-            join_type = join['type'].upper()
+            join_type = join.get('type_upper') or join['type'].upper()
             table = join['table']
             condition = join['condition']
             
             if condition['type'] == 'equality':
-                explanation = f"{join_type} JOIN with {table} on {condition['left_table']}.{condition['left_field']} = {condition['right_table']}.{condition['right_field']}"
+                explanation = _explain(join_type, table,
+                                       condition['left_table'], condition['left_field'],
+                                       condition['right_table'], condition['right_field'])
             else:
                 explanation = f"{join_type} JOIN with {table} on complex condition"
             
@@ -454,21 +486,20 @@ class JoinParser(BaseParser):
             dict: Resultado de validación
         """
         joins = self.parse_joins(query)
-        issues = []
-        warnings = []
         
-        for join in joins:
-            # Verificar tipo de JOIN
-            if join['type'] in ['right', 'full']:
-                warnings.append(f"JOIN tipo {join['type']} requiere manejo especial en MongoDB")
-            
-            # Verificar condición
-            if join['condition']['type'] == 'complex':
-                issues.append(f"Condición de JOIN compleja en tabla {join['table']}: {join['raw_condition']}")
-            
-            # Verificar si hay muchos JOINs
-            if len(joins) > 3:
-                warnings.append("Múltiples JOINs pueden afectar el rendimiento")
+        # Condiciones complejas y tipos de JOIN con manejo especial (una pasada cada uno)
+        issues = [
+            f"Condición de JOIN compleja en tabla {join['table']}: {join['raw_condition']}"
+            for join in joins if join['condition']['type'] == 'complex'
+        ]
+        warnings = [
+            f"JOIN tipo {join['type']} requiere manejo especial en MongoDB"
+            for join in joins if join['type'] in self._RIGHT_FULL_SET
+        ]
+        
+        # Verificar si hay muchos JOINs (una sola advertencia, no una por JOIN)
+        if len(joins) > 3:
+            warnings.append("Múltiples JOINs pueden afectar el rendimiento")
         
         return {
             "is_valid": len(issues) == 0,
@@ -1,16 +1,199 @@
 import re
+import sys
 import logging
+from functools import lru_cache
 from .base_parser import BaseParser
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+# Caracteres de quoting que pueden rodear un nombre de tabla
+_QUOTE_CHARS = "`[]\"'"
+
+# Patrones precompilados (evita la búsqueda en la caché interna de `re` en cada llamada)
+_SELECT_STMT_RE = re.compile(
+    r'SELECT\s+(?P<fields>.*?)\s+FROM\s+[`\["\']?(?P<table>[^\s,;()`\[\]"\']+)[`\]"\']?'
+    r'(?:\s+(?:WHERE|GROUP\s+BY|HAVING|ORDER\s+BY|LIMIT|JOIN)\b.*)?\s*;?\s*$',
+    re.IGNORECASE | re.DOTALL
+)
+_FROM_KEYWORD_RE = re.compile(r'\bFROM\b', re.IGNORECASE)
+_SELECT_FIELDS_RE = re.compile(r'SELECT\s+(.*?)\s+FROM', re.IGNORECASE | re.DOTALL)
+# El grupo capturado excluye los caracteres de quoting, así que no hace falta strip()
+_FROM_FULL_RE = re.compile(
+    r'FROM\s+[`\["\']?([^\s,;()`\[\]"\']+)[`\]"\']?'
+    r'(?:\s+(?:WHERE|GROUP\s+BY|HAVING|ORDER\s+BY|LIMIT|JOIN)\b|\s*$)',
+    re.IGNORECASE
+)
+_FROM_SIMPLE_RE = re.compile(r'FROM\s+[`\["\']?([^\s,;()`\[\]"\']+)', re.IGNORECASE)
+_CREATE_COLUMNS_RE = re.compile(r'CREATE\s+TABLE\s+\w+\s*\((.*)\)', re.IGNORECASE | re.DOTALL)
+_DEFAULT_RE = re.compile(r'DEFAULT\s+(\S+)', re.IGNORECASE)
+# Definiciones que empiezan por una restricción de tabla (no son columnas)
+_GLOBAL_CONSTRAINT_RE = re.compile(
+    r'(?:PRIMARY\s+KEY|FOREIGN\s+KEY|CONSTRAINT|INDEX|KEY|CHECK)\b|UNIQUE\s*(?:\(|(?:KEY|INDEX)\b)',
+    re.IGNORECASE
+)
+_SQL_TYPE_RE = re.compile(r'INT|VARCHAR|TEXT|DECIMAL|FLOAT|DOUBLE|BOOLEAN|BOOL|DATE|TIMESTAMP', re.IGNORECASE)
+
+# Funciones de agregación reconocidas (detección y extracción en una sola pasada)
+_AGG_PROBE = re.compile(r'\b(?:COUNT|SUM|AVG|MIN|MAX)\s*\(', re.IGNORECASE)
+_AGG_CALL_RE = re.compile(r'\b(COUNT|SUM|AVG|MIN|MAX)\s*\(([^()]*(?:\([^()]*\)[^()]*)*)\)', re.IGNORECASE)
+
+# Tipo MongoDB para cada palabra clave de tipo SQL
+_SQL_TYPE_TO_MONGO = {
+    'INT': 'int',
+    'VARCHAR': 'string',
+    'TEXT': 'string',
+    'DECIMAL': 'number',
+    'FLOAT': 'number',
+    'DOUBLE': 'number',
+    'BOOLEAN': 'bool',
+    'BOOL': 'bool',
+    'DATE': 'date',
+    'TIMESTAMP': 'date'
+}
+
+# Delimitadores para dividir listas por comas: cadenas entre comillas (se saltan
+# completas), paréntesis y comas. El texto intermedio no genera coincidencias.
+_SPLIT_DELIM_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|[(),]")
+# Tokens de DDL: cadenas entre comillas, paréntesis, comas y palabras
+_DDL_TOKEN_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|[(),]|[^\s(),'\"]+")
+
+# Delimitadores del nombre de tabla y cláusulas que pueden seguirlo (ruta rápida sin regex)
+_TABLE_DELIMS = frozenset(",;()")
+_TABLE_CLAUSES = ('WHERE', 'GROUP BY', 'HAVING', 'ORDER BY', 'LIMIT', 'JOIN')
+
+# Caracteres con los que no puede terminar una expresión seguida de un alias sin AS
+_NO_ALIAS_TAIL = frozenset(",(+-*/%=<>|")
+
+
+def _split_top_level(text):
+    """
+    Divide un texto por las comas de primer nivel (fuera de paréntesis y comillas).
+    
+    Solo se visitan los delimitadores; los fragmentos se obtienen como cortes
+    (inicio, fin) del texto original, sin acumular caracteres ni tokens.
+    
+    Args:
+        text (str): Texto a dividir
+        
+    Returns:
+        list: Fragmentos sin espacios externos (incluye el último aunque esté vacío)
+    """
+    parts = []
+    start = 0
+    level = 0
+    
+    for match in _SPLIT_DELIM_RE.finditer(text):
+        delim = match.group()
+        if delim == '(':
+            level += 1
+        elif delim == ')':
+            level -= 1
+        elif delim == ',' and level == 0:
+            parts.append(text[start:match.start()].strip())
+            start = match.end()
+    
+    parts.append(text[start:].strip())
+    return parts
+
+
+def _first_from_index(upper, start=0):
+    """
+    Posición de ' FROM ' cuando es la primera aparición de FROM a partir de start.
+    
+    Args:
+        upper (str): Consulta en mayúsculas
+        start (int): Posición desde la que buscar
+        
+    Returns:
+        int: Índice del espacio previo a FROM, o -1 si la ruta rápida no aplica
+    """
+    idx = upper.find('FROM', start)
+    if idx > 0 and upper[idx - 1] == ' ' and upper.startswith('FROM ', idx):
+        return idx - 1
+    return -1
+
+
+def _scan_table_after_from(query, upper, from_idx):
+    """
+    Lee el nombre de tabla que sigue a ' FROM ' sin usar expresiones regulares.
+    
+    Solo acepta el caso inequívoco (tabla seguida del final de la consulta o de
+    una cláusula conocida); en otro caso devuelve None para usar los patrones.
+    
+    Args:
+        query (str): Consulta original
+        upper (str): Consulta en mayúsculas (misma longitud que query)
+        from_idx (int): Índice devuelto por _first_from_index
+        
+    Returns:
+        str: Nombre de tabla sin procesar, o None
+    """
+    length = len(query)
+    i = from_idx + 6
+    while i < length and query[i].isspace():
+        i += 1
+    j = i
+    while j < length and not query[j].isspace() and query[j] not in _TABLE_DELIMS:
+        j += 1
+    if i == j:
+        return None
+    
+    rest = upper[j:].lstrip()
+    if not rest or (j < length and query[j].isspace() and rest.startswith(_TABLE_CLAUSES)):
+        return query[i:j]
+    return None
+
+
+def _read_paren_list(tokens, i):
+    """
+    Lee una lista entre paréntesis '(a, b, ...)' a partir de tokens[i].
+    
+    Args:
+        tokens (list): Tokens de la definición DDL
+        i (int): Índice donde debe estar el '(' de apertura
+        
+    Returns:
+        tuple: (lista de elementos, índice tras el ')') o (None, i) si no hay lista
+    """
+    if i >= len(tokens) or tokens[i] != '(':
+        return None, i
+    
+    items = []
+    current = []
+    level = 0
+    for j in range(i + 1, len(tokens)):
+        token = tokens[j]
+        if token == ')' and level == 0:
+            items.append(' '.join(current))
+            return [item for item in items if item], j + 1
+        if token == ',' and level == 0:
+            items.append(' '.join(current))
+            current = []
+            continue
+        if token == '(':
+            level += 1
+        elif token == ')':
+            level -= 1
+        current.append(token)
+    
+    # Paréntesis sin cerrar
+    return None, i
+
+
 class SelectParser(BaseParser):
     """
     Parser especializado para consultas SELECT de SQL.
     Analiza y extrae los campos y componentes de una consulta SELECT.
     """
     
+    __slots__ = ()
+    
+    # Parser DDL compartido (se crea en el primer uso) y tipos SQL soportados,
+    # que son estáticos para una versión dada de DDLParser
+    _ddl_parser = None
+    _supported_sql_types = None
+    
     def parse(self, query):
         """
         Analiza una consulta SELECT y extrae sus componentes.
@@ -21,20 +204,46 @@ class SelectParser(BaseParser):
         Returns:
             dict: Diccionario con información de los campos SELECT
         """
-        logger.info(f"Analizando consulta SELECT: {query}")
-        
-        # Extraer los campos a seleccionar
-        fields = self.get_select_fields(query)
+        logger.info("Analizando consulta SELECT: %s", query)
         
-        # Extraer el nombre de la tabla
-        table = self.get_table_name(query)
+        # El resultado se memoiza por texto de consulta normalizado (una sola vez
+        # aquí; los patrones toleran espacios, así que los métodos internos no
+        # vuelven a copiar la consulta). Se devuelven copias para que el
+        # llamador pueda modificarlas sin alterar la caché.
+        fields, table = _parse_cached(query.strip())
         
         return {
             "operation": "SELECT",
-            "fields": fields,
+            "fields": [dict(field) for field in fields],
             "table": table
         }
     
+    def _parse_components(self, query):
+        """
+        Extrae los campos y la tabla de una consulta SELECT (sin caché).
+        
+        Args:
+            query (str): Consulta SELECT a analizar
+            
+        Returns:
+            tuple: (lista de campos, nombre de la tabla)
+        """
+        # Extraer campos y tabla en una sola pasada sobre la consulta. Si los
+        # campos contienen otro FROM (subconsultas, UNION), se usa el análisis
+        # por separado para conservar el comportamiento del primer FROM.
+        stmt_match = _SELECT_STMT_RE.search(query)
+        if stmt_match and not _FROM_KEYWORD_RE.search(stmt_match.group('fields')):
+            fields = self._build_select_fields(stmt_match.group('fields').strip())
+            table = sys.intern(stmt_match.group('table').lower())
+        else:
+            # Extraer los campos a seleccionar
+            fields = self.get_select_fields(query)
+            
+            # Extraer el nombre de la tabla
+            table = self.get_table_name(query)
+        
+        return fields, table
+    
     def get_select_fields(self, query):
         """
         Extrae los campos a seleccionar de una consulta SELECT.
@@ -45,19 +254,34 @@ class SelectParser(BaseParser):
         Returns:
             list: Lista de diccionarios con campos y alias
         """
-        # Normalizar la consulta
-        query = query.strip()
+        # Ruta rápida: 'SELECT ' al inicio y ' FROM ' localizados con str.find
+        upper = query.upper()
+        if len(upper) == len(query):
+            start = len(query) - len(query.lstrip())
+            if upper.startswith('SELECT ', start):
+                from_idx = _first_from_index(upper, start + 6)
+                if from_idx != -1:
+                    return self._build_select_fields(query[start + 7:from_idx].strip())
         
         # Obtener la parte entre SELECT y FROM
-        select_pattern = r'SELECT\s+(.*?)\s+FROM'
-        select_match = re.search(select_pattern, query, re.IGNORECASE | re.DOTALL)
+        select_match = _SELECT_FIELDS_RE.search(query)
         
         if not select_match:
             logger.warning("No se pudo extraer campos SELECT")
             return [{"field": "*"}]  # Asumir SELECT * si no se puede analizar
         
-        fields_str = select_match.group(1).strip()
+        return self._build_select_fields(select_match.group(1).strip())
+    
+    def _build_select_fields(self, fields_str):
+        """
+        Construye la lista de campos a partir del texto entre SELECT y FROM.
         
+        Args:
+            fields_str (str): Campos SELECT sin espacios externos
+            
+        Returns:
+            list: Lista de diccionarios con campos y alias
+        """
         # Si es SELECT *, devolver un indicador especial
         if fields_str == "*":
             return [{"field": "*"}]
@@ -67,24 +291,48 @@ class SelectParser(BaseParser):
         select_fields = []
         
         for field in fields:
-            field = field.strip()
+            field_name, alias = self._split_alias(field.strip())
             
-            # Detectar alias (campo AS alias o campo alias)
-            alias_match = re.search(r'(.*?)\s+AS\s+([\w]+)$', field, re.IGNORECASE)
-            if not alias_match:
-                # Intentar con formato sin AS (campo alias)
-                alias_match = re.search(r'(.*?)\s+([\w]+)$', field)
+            # Los identificadores simples se repiten entre consultas; las
+            # expresiones (funciones, 'tabla.campo', etc.) no se internan
+            if field_name.isidentifier():
+                field_name = sys.intern(field_name)
             
-            if alias_match:
-                field_name = alias_match.group(1).strip()
-                alias = alias_match.group(2).strip()
+            if alias:
+                alias = sys.intern(alias)
                 select_fields.append({"field": field_name, "alias": alias})
             else:
-                select_fields.append({"field": field})
+                select_fields.append({"field": field_name})
         
-        logger.info(f"Campos SELECT extraídos: {select_fields}")
+        logger.info("Campos SELECT extraídos: %s", select_fields)
         return select_fields
     
+    def _split_alias(self, field):
+        """
+        Separa un campo SELECT de su alias (campo AS alias o campo alias).
+        
+        Solo inspecciona los últimos tokens del campo, sin usar expresiones
+        regulares con retroceso.
+        
+        Args:
+            field (str): Campo SELECT ya normalizado
+            
+        Returns:
+            tuple: (campo, alias) donde alias es None si no hay alias
+        """
+        tokens = field.rsplit(None, 2)
+        
+        # Formato con AS: campo AS alias
+        if len(tokens) == 3 and tokens[1].upper() == 'AS' and tokens[2].isidentifier():
+            return tokens[0], tokens[2]
+        
+        # Formato sin AS: campo alias
+        tokens = field.rsplit(None, 1)
+        if len(tokens) == 2 and tokens[1].isidentifier() and tokens[0][-1] not in _NO_ALIAS_TAIL:
+            return tokens[0], tokens[1]
+        
+        return field, None
+    
     def get_table_name(self, query):
         """
         Extrae el nombre de la tabla de una consulta SELECT.
@@ -95,26 +343,32 @@ class SelectParser(BaseParser):
         Returns:
             str: Nombre de la tabla
         """
-        # Normalizar la consulta
-        query = query.strip()
+        # Ruta rápida: ' FROM ' localizado con str.find y lectura directa del nombre
+        upper = query.upper()
+        if len(upper) == len(query):
+            from_idx = _first_from_index(upper)
+            if from_idx != -1:
+                table_name = _scan_table_after_from(query, upper, from_idx)
+                if table_name:
+                    table_name = table_name.strip(_QUOTE_CHARS)
+                    logger.info("Tabla extraída: %s", table_name)
+                    return sys.intern(table_name.lower())
         
         # Extraer la parte después de FROM y antes de la siguiente cláusula
-        from_pattern = r'FROM\s+([^\s,;()]+)(?:\s+(?:WHERE|GROUP BY|HAVING|ORDER BY|LIMIT|JOIN)|\s*$)'
-        from_match = re.search(from_pattern, query, re.IGNORECASE)
+        from_match = _FROM_FULL_RE.search(query)
         
         if from_match:
-            table_name = from_match.group(1).strip('`[]"\'')
-            logger.info(f"Tabla extraída: {table_name}")
-            return table_name.lower()
+            table_name = from_match.group(1)
+            logger.info("Tabla extraída: %s", table_name)
+            return sys.intern(table_name.lower())
         
         # Si el patrón anterior falla, intentar un patrón más simple
-        simple_pattern = r'FROM\s+([^\s,;()]+)'
-        simple_match = re.search(simple_pattern, query, re.IGNORECASE)
+        simple_match = _FROM_SIMPLE_RE.search(query)
         
         if simple_match:
-            table_name = simple_match.group(1).strip('`[]"\'')
-            logger.info(f"Tabla extraída (patrón simple): {table_name}")
-            return table_name.lower()
+            table_name = simple_match.group(1)
+            logger.info("Tabla extraída (patrón simple): %s", table_name)
+            return sys.intern(table_name.lower())
         
         logger.warning("No se pudo extraer tabla de SELECT")
         return None
@@ -129,33 +383,7 @@ class SelectParser(BaseParser):
         Returns:
             list: Lista de campos individuales
         """
-        fields = []
-        current = ""
-        in_quotes = False
-        quote_char = None
-        level = 0
-        
-        for char in fields_str + ',':  # Añadir coma al final para capturar el último campo
-            if char in ["'", '"'] and (not in_quotes or char == quote_char):
-                in_quotes = not in_quotes
-                if in_quotes:
-                    quote_char = char
-                else:
-                    quote_char = None
-                current += char
-            elif char == '(' and not in_quotes:
-                level += 1
-                current += char
-            elif char == ')' and not in_quotes:
-                level -= 1
-                current += char
-            elif char == ',' and level == 0 and not in_quotes:
-                fields.append(current.strip())
-                current = ""
-            else:
-                current += char
-        
-        return fields
+        return _split_top_level(fields_str)
     
     def has_aggregate_functions(self, fields):
         """
@@ -167,27 +395,19 @@ class SelectParser(BaseParser):
         Returns:
             bool: True si hay funciones de agregación, False en caso contrario
         """
-        agg_functions = ["COUNT", "SUM", "AVG", "MIN", "MAX"]
-        
-        for field_info in fields:
-            field = field_info.get("field", "").upper()
-            for func in agg_functions:
-                if f"{func}(" in field:
-                    return True
-        
-        return False
+        return any(_AGG_PROBE.search(field_info.get("field", "")) for field_info in fields)
     
 
     def _get_ddl_parser(self):
-        """Obtiene el parser DDL (lazy loading)."""
-        if not hasattr(self, '_ddl_parser') or self._ddl_parser is None:
+        """Obtiene el parser DDL (lazy loading, una instancia compartida por la clase)."""
+        cls = type(self)
+        if cls._ddl_parser is None:
             try:
                 from .ddl_parser import DDLParser
-                self._ddl_parser = DDLParser()
+                cls._ddl_parser = DDLParser()
             except ImportError:
                 logger.warning("DDLParser no disponible")
-                self._ddl_parser = None
-        return self._ddl_parser
+        return cls._ddl_parser
 
 
     def get_create_table_info(self):
@@ -201,14 +421,14 @@ class SelectParser(BaseParser):
             table_name = self.get_table_name()
             
             # Extraer definición de columnas entre paréntesis
-            columns_match = re.search(r'CREATE\s+TABLE\s+\w+\s*\((.*)\)', self.query, re.IGNORECASE | re.DOTALL)
+            columns_match = _CREATE_COLUMNS_RE.search(self.query)
             if not columns_match:
                 raise ValueError("No se encontró definición de columnas en CREATE TABLE")
             
             columns_str = columns_match.group(1).strip()
             
             # Parsear columnas individuales
-            columns = self.parse_columns_definition(columns_str)
+            columns, has_primary_key = self.parse_columns_definition(columns_str)
             
             # Extraer constraints y índices
             constraints = self.extract_constraints(columns_str)
@@ -218,16 +438,16 @@ class SelectParser(BaseParser):
                 'columns': columns,
                 'constraints': constraints,
                 'total_columns': len(columns),
-                'has_primary_key': any(col.get('is_primary_key', False) for col in columns),
-                'has_indexes': len(constraints.get('indexes', [])) > 0,
+                'has_primary_key': has_primary_key,
+                'has_indexes': bool(constraints['indexes']),
                 'original_definition': columns_str
             }
             
-            logger.info(f"Información de CREATE TABLE extraída: {table_name} con {len(columns)} columnas")
+            logger.info("Información de CREATE TABLE extraída: %s con %d columnas", table_name, len(columns))
             return create_info
             
         except Exception as e:
-            logger.error(f"Error extrayendo información de CREATE TABLE: {e}")
+            logger.error("Error extrayendo información de CREATE TABLE: %s", e)
             return {
                 'table_name': self.get_table_name(),
                 'columns': [],
@@ -243,50 +463,42 @@ class SelectParser(BaseParser):
     def parse_columns_definition(self, columns_str):
         """
         ✅ NUEVO: Parsea la definición de columnas
+        
+        Returns:
+            tuple: (lista de columnas, True si alguna columna es PRIMARY KEY)
         """
         columns = []
+        has_primary_key = False
         
         # Dividir por comas (pero respetando paréntesis anidados)
         column_definitions = self.split_columns(columns_str)
         
         for col_def in column_definitions:
             col_def = col_def.strip()
-            if not col_def:
-                continue
-                
-            # Saltar constraints globales (PRIMARY KEY, FOREIGN KEY, etc.)
-            if any(keyword in col_def.upper() for keyword in ['PRIMARY KEY (', 'FOREIGN KEY', 'INDEX', 'KEY']):
+            
+            # Saltar vacíos y constraints globales (PRIMARY KEY (...), FOREIGN KEY, etc.).
+            # Solo se mira el inicio: 'id INT PRIMARY KEY' sigue siendo una columna.
+            if not col_def or _GLOBAL_CONSTRAINT_RE.match(col_def):
                 continue
             
             column_info = self.parse_single_column(col_def)
             if column_info:
                 columns.append(column_info)
+                if column_info['is_primary_key']:
+                    has_primary_key = True
         
-        return columns
+        return columns, has_primary_key
 
 
     def split_columns(self, columns_str):
         """
         ✅ NUEVO: Divide columnas respetando paréntesis
         """
-        columns = []
-        current_column = ""
-        paren_count = 0
-        
-        for char in columns_str:
-            if char == '(':
-                paren_count += 1
-            elif char == ')':
-                paren_count -= 1
-            elif char == ',' and paren_count == 0:
-                columns.append(current_column.strip())
-                current_column = ""
-                continue
-            
-            current_column += char
+        columns = _split_top_level(columns_str)
         
-        if current_column.strip():
-            columns.append(current_column.strip())
+        # A diferencia de los campos SELECT, una coma final no genera columna vacía
+        if columns and not columns[-1]:
+            columns.pop()
         
         return columns
 
@@ -304,13 +516,14 @@ class SelectParser(BaseParser):
             data_type = parts[1]
             
             # Extraer información adicional
-            is_primary_key = 'PRIMARY KEY' in col_def.upper()
-            is_not_null = 'NOT NULL' in col_def.upper()
-            is_unique = 'UNIQUE' in col_def.upper()
+            col_def_upper = col_def.upper()
+            is_primary_key = 'PRIMARY KEY' in col_def_upper
+            is_not_null = 'NOT NULL' in col_def_upper
+            is_unique = 'UNIQUE' in col_def_upper
             
             # Extraer valor por defecto
             default_value = None
-            default_match = re.search(r'DEFAULT\s+(\S+)', col_def, re.IGNORECASE)
+            default_match = _DEFAULT_RE.search(col_def)
             if default_match:
                 default_value = default_match.group(1)
             
@@ -325,7 +538,7 @@ class SelectParser(BaseParser):
             }
             
         except Exception as e:
-            logger.warning(f"Error parseando columna '{col_def}': {e}")
+            logger.warning("Error parseando columna '%s': %s", col_def, e)
             return None
 
 
@@ -333,20 +546,8 @@ class SelectParser(BaseParser):
         """
         ✅ NUEVO: Mapea tipos SQL a MongoDB
         """
-        sql_type_upper = sql_type.upper()
-        
-        if 'INT' in sql_type_upper:
-            return 'int'
-        elif 'VARCHAR' in sql_type_upper or 'TEXT' in sql_type_upper:
-            return 'string'
-        elif 'DECIMAL' in sql_type_upper or 'FLOAT' in sql_type_upper or 'DOUBLE' in sql_type_upper:
-            return 'number'
-        elif 'BOOLEAN' in sql_type_upper or 'BOOL' in sql_type_upper:
-            return 'bool'
-        elif 'DATE' in sql_type_upper or 'TIMESTAMP' in sql_type_upper:
-            return 'date'
-        else:
-            return 'mixed'
+        type_match = _SQL_TYPE_RE.search(sql_type)
+        return _SQL_TYPE_TO_MONGO[type_match.group().upper()] if type_match else 'mixed'
 
     def extract_constraints(self, columns_str):
         """
@@ -359,20 +560,40 @@ class SelectParser(BaseParser):
             'unique_constraints': []
         }
         
-        # Buscar PRIMARY KEY
-        pk_match = re.search(r'PRIMARY\s+KEY\s*\(([^)]+)\)', columns_str, re.IGNORECASE)
-        if pk_match:
-            pk_fields = [field.strip() for field in pk_match.group(1).split(',')]
-            constraints['primary_keys'] = pk_fields
-        
-        # Buscar FOREIGN KEY
-        fk_matches = re.finditer(r'FOREIGN\s+KEY\s*\(([^)]+)\)\s+REFERENCES\s+(\w+)\s*\(([^)]+)\)', columns_str, re.IGNORECASE)
-        for fk_match in fk_matches:
-            constraints['foreign_keys'].append({
-                'columns': [col.strip() for col in fk_match.group(1).split(',')],
-                'referenced_table': fk_match.group(2),
-                'referenced_columns': [col.strip() for col in fk_match.group(3).split(',')]
-            })
+        # Recorrido lineal de tokens (sin retroceso de regex sobre el DDL)
+        tokens = [match.group() for match in _DDL_TOKEN_RE.finditer(columns_str)]
+        upper_tokens = [token.upper() for token in tokens]
+        i = 0
+        
+        while i < len(tokens):
+            word = upper_tokens[i]
+            
+            # PRIMARY KEY (col, ...): se toma la primera definición
+            if word == 'PRIMARY' and upper_tokens[i + 1:i + 2] == ['KEY']:
+                pk_fields, j = _read_paren_list(tokens, i + 2)
+                if pk_fields and not constraints['primary_keys']:
+                    constraints['primary_keys'] = pk_fields
+                i = j if pk_fields is not None else i + 1
+                continue
+            
+            # FOREIGN KEY (col, ...) REFERENCES tabla (col, ...)
+            if word == 'FOREIGN' and upper_tokens[i + 1:i + 2] == ['KEY']:
+                fk_columns, j = _read_paren_list(tokens, i + 2)
+                if fk_columns and upper_tokens[j:j + 1] == ['REFERENCES'] and j + 1 < len(tokens):
+                    referenced_table = tokens[j + 1].strip(_QUOTE_CHARS)
+                    referenced_columns, k = _read_paren_list(tokens, j + 2)
+                    if referenced_columns:
+                        constraints['foreign_keys'].append({
+                            'columns': fk_columns,
+                            'referenced_table': referenced_table,
+                            'referenced_columns': referenced_columns
+                        })
+                        i = k
+                        continue
+                i += 1
+                continue
+            
+            i += 1
         
         return constraints
 
@@ -395,10 +616,13 @@ class SelectParser(BaseParser):
         Returns:
             dict: Tipos SQL soportados por categoría
         """
-        parser = self._get_ddl_parser()
-        if parser:
-            return parser.get_supported_sql_types()
-        return {}
+        cls = type(self)
+        if cls._supported_sql_types is None:
+            parser = self._get_ddl_parser()
+            if not parser:
+                return {}
+            cls._supported_sql_types = parser.get_supported_sql_types()
+        return cls._supported_sql_types
 
     def extract_functions(self, fields):
         """
@@ -411,28 +635,37 @@ class SelectParser(BaseParser):
             list: Lista de diccionarios con información de funciones
         """
         functions = []
-        agg_functions = ["COUNT", "SUM", "AVG", "MIN", "MAX"]
         
         for field_info in fields:
             field = field_info.get("field", "")
             alias = field_info.get("alias", "")
             
-            for func in agg_functions:
-                func_pattern = fr'{func}\s*\((.*?)\)'
-                match = re.search(func_pattern, field, re.IGNORECASE)
+            # Una sola pasada por campo para las cinco funciones
+            for match in _AGG_CALL_RE.finditer(field):
+                func = match.group(1).lower()
+                inner_field = match.group(2).strip()
+                # Si no hay alias, generar uno
+                if not alias:
+                    alias = f"{func}_{inner_field}".lower()
+                    if inner_field == "*":
+                        alias = f"{func}_all"
                 
-                if match:
-                    inner_field = match.group(1).strip()
-                    # Si no hay alias, generar uno
-                    if not alias:
-                        alias = f"{func.lower()}_{inner_field.lower()}"
-                        if inner_field == "*":
-                            alias = f"{func.lower()}_all"
-                    
-                    functions.append({
-                        "function": func.lower(),
-                        "field": inner_field,
-                        "alias": alias
-                    })
-        
-        return functions
\ No newline at end of file
+                functions.append({
+                    "function": func,
+                    "field": inner_field,
+                    "alias": alias
+                })
+        
+        return functions
+
+
+@lru_cache(maxsize=1024)
+def _parse_cached(query):
+    """
+    Memoiza el análisis de SELECT por texto de consulta.
+    
+    Los campos se guardan como tuplas de pares para que la entrada de caché
+    sea inmutable; el texto SQL es la clave, así que no hace falta invalidar.
+    """
+    fields, table = SelectParser()._parse_components(query)
+    return tuple(tuple(field.items()) for field in fields), table
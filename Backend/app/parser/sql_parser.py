@@ -1,17 +1,216 @@
 import sqlparse
 import re
+import importlib
+import os
+import sys
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from .base_parser import BaseParser
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+# Primera palabra clave de la consulta -> tipo de consulta
+_KW_TO_TYPE = {
+    "SELECT": "SELECT",
+    "INSERT": "INSERT",
+    "UPDATE": "UPDATE",
+    "DELETE": "DELETE",
+    "CREATE": "CREATE",
+    "DROP": "DROP",
+    "ALTER": "ALTER",
+}
+
+# Patrones precompilados para extraer el nombre de la tabla según el tipo de consulta
+# (un solo patrón por tipo; la clase negada cubre también el caso "tabla WHERE ...")
+_COMPILED_PATTERNS = {
+    "SELECT": re.compile(r"\bFROM\s+([^\s,;()]+)", re.IGNORECASE),  # FROM tabla
+    "INSERT": re.compile(r"\bINSERT\s+INTO\s+([^\s(]+)", re.IGNORECASE),  # INSERT INTO tabla
+    "UPDATE": re.compile(r"\bUPDATE\s+([^\s,;()]+)", re.IGNORECASE),  # UPDATE tabla
+    "DELETE": re.compile(r"\bDELETE\s+FROM\s+([^\s,;()]+)", re.IGNORECASE),  # DELETE FROM tabla
+    # CREATE TABLE [IF NOT EXISTS] tabla
+    "CREATE": re.compile(r"\bCREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?([^\s(;]+)", re.IGNORECASE),
+    "DROP": re.compile(r"\bDROP\s+TABLE\s+([^\s;]+)", re.IGNORECASE),  # DROP TABLE tabla
+    "ALTER": re.compile(r"\bALTER\s+TABLE\s+([^\s;]+)", re.IGNORECASE),  # ALTER TABLE tabla
+}
+
+# Palabra clave tras la cual aparece la tabla en los tokens de sqlparse
+_TABLE_ANCHORS = {
+    "SELECT": "FROM",
+    "INSERT": "INTO",
+    "UPDATE": "UPDATE",
+    "DELETE": "FROM",
+    "CREATE": "TABLE",
+    "DROP": "TABLE",
+    "ALTER": "TABLE",
+}
+
+# Palabra clave que precede a la tabla y delimitadores que la terminan,
+# para la búsqueda literal sin expresiones regulares
+_SCAN_KEYWORDS = {
+    "SELECT": (" FROM ", ",;()"),
+    "DELETE": (" FROM ", ",;()"),
+    "INSERT": (" INTO ", "("),
+}
+
+# Tamaño mínimo de lote para que parse_many reparta el trabajo entre procesos
+_PARALLEL_MIN_BATCH = 256
+
+# Cláusulas ORDER BY y LIMIT (ancladas al inicio o a un espacio, sin rellenar la consulta).
+# Las variantes _CS no usan IGNORECASE y se buscan sobre la consulta en mayúsculas;
+# _ORDER_BY_RE queda para cuando upper() cambia la longitud de la consulta
+_ORDER_BY_RE = re.compile(r'(?:^|\s)ORDER\s+BY\s+(.*?)(?:\s+LIMIT|\s*;|\s*$)', re.IGNORECASE | re.DOTALL)
+_ORDER_BY_RE_CS = re.compile(r'(?:^|\s)ORDER\s+BY\s+(.*?)(?:\s+LIMIT|\s*;|\s*$)', re.DOTALL)
+_LIMIT_RE_CS = re.compile(r'(?:^|\s)LIMIT\s+(\d+)(?=\s|;|$)')
+
+# Campo de ORDER BY con su dirección opcional
+_ORDER_FIELD_RE = re.compile(r'(?:^|,)\s*([^\s,]+)(?:\s+([^\s,]+))?\s*(?=,|$)')
+_ORDER_DIRECTIONS = {"ASC": 1, "DESC": -1}
+
+# Definición de CREATE TABLE y sus columnas
+# (la cabecera hasta el paréntesis de apertura; el cierre se busca con _DELIM_RE)
+_CREATE_HEADER_RE = re.compile(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?[^\s(]+\s*\(', re.IGNORECASE)
+# Paréntesis y comas para dividir columnas (las cadenas entre comillas se saltan enteras)
+_DELIM_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|[(),]")
+# Modificadores de columna; el nombre del grupo que coincide identifica cada uno
+_COL_FLAGS_RE = re.compile(
+    r'\b(?:(?P<primary_key>PRIMARY\s+KEY)|(?P<not_null>NOT\s+NULL)|(?P<unique>UNIQUE))\b',
+    re.IGNORECASE
+)
+# Palabras clave de tipo SQL y su tipo MongoDB
+_TYPE_RE = re.compile(r'INT|VARCHAR|TEXT|DECIMAL|FLOAT|DOUBLE|BOOLEAN|BOOL|DATE|TIMESTAMP', re.IGNORECASE)
+_TYPE_MAP = {
+    'INT': 'int',
+    'VARCHAR': 'string',
+    'TEXT': 'string',
+    'DECIMAL': 'number',
+    'FLOAT': 'number',
+    'DOUBLE': 'number',
+    'BOOLEAN': 'bool',
+    'BOOL': 'bool',
+    'DATE': 'date',
+    'TIMESTAMP': 'date'
+}
+# Definiciones que empiezan por una restricción de tabla (no son columnas)
+_SKIP_RE = re.compile(
+    r'(?:PRIMARY\s+KEY|FOREIGN\s+KEY|CONSTRAINT|INDEX|KEY|CHECK)\b|UNIQUE\s*(?:\(|(?:KEY|INDEX)\b)',
+    re.IGNORECASE
+)
+_DEFAULT_RE = re.compile(r'DEFAULT\s+(\S+)', re.IGNORECASE)
+_PRIMARY_KEY_RE = re.compile(r'PRIMARY\s+KEY\s*\(([^)]+)\)', re.IGNORECASE)
+_FOREIGN_KEY_RE = re.compile(r'FOREIGN\s+KEY\s*\(([^)]+)\)\s+REFERENCES\s+(\w+)\s*\(([^)]+)\)', re.IGNORECASE)
+
+
+def _scan_table_name(sql, query_type):
+    """
+    Extrae el nombre de la tabla con str.find en lugar de una expresión regular.
+    
+    Args:
+        sql (str): Consulta SQL original
+        query_type (str): Tipo de consulta ya detectado
+        
+    Returns:
+        str or None: Nombre de la tabla sin limpiar, o None si hay que usar los patrones
+    """
+    scan = _SCAN_KEYWORDS.get(query_type)
+    if scan is None:
+        return None
+    keyword, delims = scan
+    upper = sql.upper()
+    # upper() puede cambiar la longitud con algunos caracteres Unicode
+    if len(upper) != len(sql):
+        return None
+    idx = upper.find(keyword)
+    if idx < 0:
+        return None
+    
+    n = len(sql)
+    start = idx + len(keyword)
+    while start < n and sql[start].isspace():
+        start += 1
+    end = start
+    while end < n:
+        ch = sql[end]
+        if ch.isspace() or ch in delims:
+            break
+        end += 1
+    return sql[start:end] if end > start else None
+
+
+def _clean_table_name(table_name):
+    """
+    Limpia el nombre de tabla capturado: comillas, alias y mayúsculas.
+    
+    Args:
+        table_name (str): Nombre capturado de la consulta
+        
+    Returns:
+        str: Nombre en minúsculas e internado
+    """
+    table_name = table_name.strip('`[]"\'')
+    # Limpiar cualquier otra sintaxis SQL (como alias)
+    space = table_name.find(' ')
+    if space >= 0:
+        table_name = table_name[:space]
+    return sys.intern(table_name.lower())
+
+
+def _extract_create_columns(sql):
+    """
+    Obtiene el texto entre los paréntesis de CREATE TABLE (...), buscando el
+    paréntesis de cierre que equilibra al de apertura en una sola pasada.
+    
+    Args:
+        sql (str): Consulta CREATE TABLE
+        
+    Returns:
+        str or None: Definición de columnas, o None si no hay paréntesis equilibrados
+    """
+    header = _CREATE_HEADER_RE.search(sql)
+    if not header:
+        return None
+    start = header.end()
+    depth = 1
+    for match in _DELIM_RE.finditer(sql, start):
+        delim = match.group()
+        if delim == '(':
+            depth += 1
+        elif delim == ')':
+            depth -= 1
+            if depth == 0:
+                return sql[start:match.start()]
+    return None
+
+
+def _order_direction(direction_str):
+    """
+    Convierte la dirección de un campo de ORDER BY al valor de MongoDB.
+    
+    Args:
+        direction_str (str or None): ASC, DESC o None si no se indicó
+        
+    Returns:
+        int: 1 para ASC (por defecto) o -1 para DESC
+    """
+    if direction_str is None:
+        return 1
+    direction = _ORDER_DIRECTIONS.get(direction_str.upper())
+    if direction is None:
+        logger.warning("Dirección de orden desconocida: %s, usando ASC", direction_str)
+        return 1
+    return direction
+
+
 class SQLParser:
     """
     Parser principal que coordina el análisis de consultas SQL.
     Utiliza parsers especializados para diferentes tipos de consultas.
     """
     
+    # Atributos fijos: se crea un parser por consulta y así se evita el __dict__ por instancia
+    __slots__ = ("sql_query", "_cache", "_leading_kw", "_parsed", "_sql_upper")
+    
     def __init__(self, sql_query):
         """
         Inicializa el parser con una consulta SQL.
@@ -20,15 +219,40 @@ class SQLParser:
             sql_query (str): La consulta SQL a analizar
         """
         self.sql_query = sql_query
-        self.parsed = sqlparse.parse(sql_query)
-        logger.info(f"Consulta SQL recibida para analizar: {sql_query}")
+        # Resultados ya calculados de los accesores (la consulta no cambia)
+        self._cache = {}
+        head = sql_query.lstrip()[:7].upper().split(None, 1)
+        self._leading_kw = head[0] if head else ""
+        self._parsed = None
+        self._sql_upper = None
+        logger.info("Consulta SQL recibida para analizar: %s", sql_query)
+        # Los parsers especializados son compartidos y se crean en el primer uso (ver _get_parser)
+    
+    @property
+    def parsed(self):
+        """
+        Resultado de sqlparse para la consulta. Se calcula solo cuando se
+        necesitan los tokens y se guarda en la instancia.
         
-        # Los parsers especializados se importarán y configurarán según sea necesario
-        # 🆕 Nuevos parsers (lazy loading para evitar dependencias circulares)
-        self._function_parser = None
-        self._advanced_parser = None
-        self._join_parser = None
-        self._formatter = None
+        Returns:
+            tuple: Sentencias analizadas por sqlparse.
+        """
+        if self._parsed is None:
+            self._parsed = _sqlparse_cached(self.sql_query)
+        return self._parsed
+    
+    @property
+    def sql_upper(self):
+        """
+        La consulta en mayúsculas, calculada una sola vez por instancia para
+        las comprobaciones rápidas de palabras clave.
+        
+        Returns:
+            str: Consulta SQL en mayúsculas.
+        """
+        if self._sql_upper is None:
+            self._sql_upper = self.sql_query.upper()
+        return self._sql_upper
     
     def get_tokens(self):
         """
@@ -48,31 +272,37 @@ class SQLParser:
         Returns:
             str: Tipo de consulta en mayúsculas.
         """
+        return self._analysis()[0]
+    
+    def _analysis(self):
+        """
+        Obtiene (tipo, tabla, límite), calculados una sola vez por instancia.
+        
+        Returns:
+            tuple: Tipo de consulta, nombre de la tabla y valor de LIMIT.
+        """
+        cache = self._cache
+        if 'analysis' not in cache:
+            query_type = self._detect_query_type()
+            table_name = self._extract_table_name(query_type)
+            limit = self._extract_limit() if "LIMIT" in self.sql_upper else None
+            cache['analysis'] = (query_type, table_name, limit)
+        return cache['analysis']
+    
+    def _detect_query_type(self):
+        """Calcula el tipo de consulta (ver get_query_type)."""
+        # Camino rápido: la primera palabra clave determina el tipo sin usar sqlparse
+        query_type = _KW_TO_TYPE.get(self._leading_kw)
+        if query_type:
+            return query_type
+        
         if not self.parsed:
             return None
             
-        # Obtener el tipo directamente de sqlparse
-        query_type = self.parsed[0].get_type()
-        
-        # Si sqlparse no pudo determinar el tipo, hacer un análisis manual
-        if not query_type:
-            sql_upper = self.sql_query.upper().strip()
-            if sql_upper.startswith("SELECT"):
-                query_type = "SELECT"
-            elif sql_upper.startswith("INSERT"):
-                query_type = "INSERT"
-            elif sql_upper.startswith("UPDATE"):
-                query_type = "UPDATE"
-            elif sql_upper.startswith("DELETE"):
-                query_type = "DELETE"
-            elif sql_upper.startswith("CREATE"):
-                query_type = "CREATE"
-            elif sql_upper.startswith("DROP"):
-                query_type = "DROP"
-            elif sql_upper.startswith("ALTER"):
-                query_type = "ALTER"
-        
-        return query_type
+        # Obtener el tipo directamente de sqlparse. El análisis manual por la
+        # primera palabra clave ya se hizo arriba sobre la cabecera de la consulta
+        # (_leading_kw), así que no hace falta pasar a mayúsculas la consulta entera.
+        return self.parsed[0].get_type() or None
     
     def get_table_name(self):
         """
@@ -81,73 +311,47 @@ class SQLParser:
         Returns:
             str: Nombre de la tabla como cadena (str).
         """
-        query_type = self.get_query_type()
-        logger.info(f"Tipo de consulta detectado: {query_type}")
-        
-        # Normalizar la consulta para el análisis
-        sql = " " + self.sql_query.strip() + " "
-        
-        # Patrones de expresiones regulares para diferentes tipos de consultas
-        patterns = {
-            "SELECT": [
-                r"FROM\s+([^\s,;()]+)",  # FROM tabla
-                r"FROM\s+([^\s]+)\s+",   # FROM tabla WHERE/GROUP/ORDER/etc
-            ],
-            "INSERT": [
-                r"INSERT\s+INTO\s+([^\s(]+)",  # INSERT INTO tabla
-                r"INSERT\s+INTO\s+([^\s]+)\s+", # INSERT INTO tabla VALUES/SELECT
-            ],
-            "UPDATE": [
-                r"UPDATE\s+([^\s,;()]+)",  # UPDATE tabla
-                r"UPDATE\s+([^\s]+)\s+",   # UPDATE tabla SET
-            ],
-            "DELETE": [
-                r"DELETE\s+FROM\s+([^\s,;()]+)",  # DELETE FROM tabla
-                r"DELETE\s+FROM\s+([^\s]+)\s+",   # DELETE FROM tabla WHERE
-            ],
-            "CREATE": [
-                r"CREATE\s+TABLE\s+([^\s(]+)",  # CREATE TABLE tabla
-                r"CREATE\s+TABLE\s+IF\s+NOT\s+EXISTS\s+([^\s(]+)",  # CREATE TABLE IF NOT EXISTS tabla
-            ],
-            "DROP": [
-                r"DROP\s+TABLE\s+([^\s;]+)",  # DROP TABLE tabla
-            ],
-            "ALTER": [
-                r"ALTER\s+TABLE\s+([^\s;]+)",  # ALTER TABLE tabla
-            ]
-        }
-        
-        # Buscar patrones según el tipo de consulta
-        if query_type in patterns:
-            for pattern in patterns[query_type]:
-                match = re.search(pattern, sql, re.IGNORECASE)
-                if match:
-                    table_name = match.group(1).strip('`[]"\'')
-                    # Limpiar cualquier otra sintaxis SQL (como alias)
-                    if ' ' in table_name:
-                        table_name = table_name.split(' ')[0]
-                    logger.info(f"Nombre de tabla extraído con regex: {table_name}")
-                    return table_name.lower()
-        
-        # Si no se encontró con regex, intentar con un enfoque basado en tokens
+        return self._analysis()[1]
+    
+    def _extract_table_name(self, query_type):
+        """Calcula el nombre de la tabla para el tipo de consulta dado (ver get_table_name)."""
+        logger.info("Tipo de consulta detectado: %s", query_type)
+        
+        # Búsqueda literal de la palabra clave; los patrones solo si no basta
+        table_name = _scan_table_name(self.sql_query, query_type)
+        if table_name is None:
+            # Buscar patrones según el tipo de consulta
+            pattern = _COMPILED_PATTERNS.get(query_type)
+            match = pattern.search(self.sql_query) if pattern else None
+            if match:
+                table_name = match.group(1)
+        
+        if table_name is not None:
+            table_name = _clean_table_name(table_name)
+            logger.info("Nombre de tabla extraído: %s", table_name)
+            return table_name
+        
+        # Si no se encontró con regex, intentar con un enfoque basado en tokens:
+        # la tabla es el primer token tras la palabra clave ancla del tipo de consulta
         try:
-            if query_type == "SELECT":
-                for i, token in enumerate(self.get_tokens()):
-                    if token.ttype is sqlparse.tokens.Keyword and token.value.upper() == "FROM":
-                        # El siguiente token después de FROM debería ser la tabla
-                        j = i + 1
-                        while j < len(self.get_tokens()):
-                            table_token = self.get_tokens()[j]
-                            if table_token.ttype is not sqlparse.tokens.Whitespace:
-                                if isinstance(table_token, sqlparse.sql.Identifier):
-                                    table_name = table_token.get_real_name()
-                                else:
-                                    table_name = str(table_token).strip('`[]"\'')
-                                logger.info(f"Nombre de tabla extraído con tokens: {table_name}")
-                                return table_name.lower()
-                            j += 1
+            anchor = _TABLE_ANCHORS.get(query_type)
+            if anchor:
+                tokens = self.get_tokens()
+                anchor_idx = next((i for i, token in enumerate(tokens)
+                                   if token.is_keyword and token.normalized == anchor), -1)
+                if anchor_idx >= 0:
+                    # Saltar espacios y palabras clave intermedias (p. ej. IF NOT EXISTS)
+                    table_token = next((token for token in tokens[anchor_idx + 1:]
+                                        if not token.is_whitespace and not token.is_keyword), None)
+                    if table_token is not None:
+                        if isinstance(table_token, (sqlparse.sql.Identifier, sqlparse.sql.Function)):
+                            table_name = table_token.get_real_name()
+                        else:
+                            table_name = str(table_token).strip('`[]"\'')
+                        logger.info("Nombre de tabla extraído con tokens: %s", table_name)
+                        return sys.intern(table_name.lower())
         except Exception as e:
-            logger.error(f"Error al extraer nombre de tabla con tokens: {e}")
+            logger.error("Error al extraer nombre de tabla con tokens: %s", e)
         
         logger.warning("No se pudo determinar el nombre de la tabla")
         return None
@@ -161,70 +365,58 @@ class SQLParser:
             dict: Diccionario con los campos y direcciones de ordenamiento
             Ejemplo: {'edad': -1, 'nombre': 1}
         """
+        cache = self._cache
+        if 'order_by' not in cache:
+            cache['order_by'] = self._extract_order_by()
+        return cache['order_by']
+    
+    def _extract_order_by(self):
+        """Calcula la cláusula ORDER BY (ver get_order_by)."""
         logger.info("Extrayendo cláusula ORDER BY de la consulta")
         
-        # Limpiar y normalizar la consulta
-        query = " " + self.sql_query.strip() + " "
-        
-        # Regex que captura ORDER BY hasta el final o antes de LIMIT
-        pattern = r'\sORDER\s+BY\s+(.*?)(?:\s+LIMIT|\s*;|\s*$)'
-        match = re.search(pattern, query, re.IGNORECASE | re.DOTALL)
+        # Regex que captura ORDER BY hasta el final o antes de LIMIT. Se busca sin
+        # IGNORECASE en la versión en mayúsculas y se corta la consulta original
+        # para conservar el nombre de los campos
+        sql = self.sql_query
+        upper = self.sql_upper
+        if len(upper) == len(sql):
+            match = _ORDER_BY_RE_CS.search(upper)
+            order_clause = sql[match.start(1):match.end(1)] if match else None
+        else:
+            match = _ORDER_BY_RE.search(sql)
+            order_clause = match.group(1) if match else None
         
-        if not match:
+        if order_clause is None:
             logger.info("No se encontró cláusula ORDER BY en la consulta")
             return {}
         
-        order_clause = match.group(1).strip()
-        logger.info(f"Cláusula ORDER BY extraída: '{order_clause}'")
+        order_clause = order_clause.strip()
+        logger.info("Cláusula ORDER BY extraída: '%s'", order_clause)
         
         # Parsear campos de ordenamiento
         order_dict = self._parse_order_fields(order_clause)
         
-        logger.info(f"ORDER BY parseado: {order_dict}")
+        logger.info("ORDER BY parseado: %s", order_dict)
         return order_dict
 
     def _parse_order_fields(self, order_clause):
         """
         Parsea los campos de ORDER BY
         """
-        order_dict = {}
-        
         # Limpiar punto y coma si existe
         if order_clause.endswith(';'):
             order_clause = order_clause[:-1].strip()
         
-        # Dividir por comas para múltiples campos
-        fields = [field.strip() for field in order_clause.split(',')]
+        # Cada coincidencia es un campo (al inicio o tras una coma) con su dirección
+        # opcional; los fragmentos con más de dos palabras no coinciden y se omiten
+        order_dict = {
+            match.group(1): _order_direction(match.group(2))
+            for match in _ORDER_FIELD_RE.finditer(order_clause)
+        }
         
-        for field in fields:
-            if not field:
-                continue
-            
-            # Separar campo y dirección
-            parts = field.strip().split()
-            
-            if len(parts) == 1:
-                # Solo campo, por defecto ASC
-                field_name = parts[0]
-                direction = 1  # ASC en MongoDB
-            elif len(parts) == 2:
-                # Campo y dirección
-                field_name = parts[0]
-                direction_str = parts[1].upper()
-                
-                if direction_str == "DESC":
-                    direction = -1  # DESC en MongoDB
-                elif direction_str == "ASC":
-                    direction = 1   # ASC en MongoDB
-                else:
-                    logger.warning(f"Dirección de orden desconocida: {direction_str}, usando ASC")
-                    direction = 1
-            else:
-                logger.warning(f"Formato de campo ORDER BY inválido: {field}")
-                continue
-            
-            order_dict[field_name] = direction
-            logger.debug(f"Campo de orden parseado: {field_name} -> {direction}")
+        if logger.isEnabledFor(logging.DEBUG):
+            for field_name, direction in order_dict.items():
+                logger.debug("Campo de orden parseado: %s -> %s", field_name, direction)
         
         return order_dict
 
@@ -237,11 +429,10 @@ class SQLParser:
         Returns:
             dict: Diccionario con las condiciones.
         """
-        # Importación perezosa para evitar dependencias circulares
-        from .where_parser import WhereParser
-        
-        where_parser = WhereParser()
-        return where_parser.parse(self.sql_query)
+        cache = self._cache
+        if 'where' not in cache:
+            cache['where'] = _get_parser('where').parse(self.sql_query)
+        return cache['where']
     
     def get_select_fields(self):
         """
@@ -251,11 +442,7 @@ class SQLParser:
         Returns:
             list: Lista de campos a seleccionar.
         """
-        # Importación perezosa para evitar dependencias circulares
-        from .select_parser import SelectParser
-        
-        select_parser = SelectParser()
-        return select_parser.get_select_fields(self.sql_query)
+        return _get_parser('select').get_select_fields(self.sql_query)
     
     def get_insert_values(self):
         """
@@ -265,11 +452,7 @@ class SQLParser:
         Returns:
             dict: Diccionario con los valores a insertar.
         """
-        # Importación perezosa para evitar dependencias circulares
-        from .crud_parser import CRUDParser
-        
-        crud_parser = CRUDParser()
-        return crud_parser.parse_insert(self.sql_query)
+        return _get_parser('crud').parse_insert(self.sql_query)
     
     def get_update_values(self):
         """
@@ -279,11 +462,7 @@ class SQLParser:
         Returns:
             dict: Diccionario con los valores a actualizar.
         """
-        # Importación perezosa para evitar dependencias circulares
-        from .crud_parser import CRUDParser
-        
-        crud_parser = CRUDParser()
-        return crud_parser.parse_update(self.sql_query)
+        return _get_parser('crud').parse_update(self.sql_query)
     
     def get_delete_condition(self):
         """
@@ -293,11 +472,7 @@ class SQLParser:
         Returns:
             dict: Diccionario con la condición para eliminar.
         """
-        # Importación perezosa para evitar dependencias circulares
-        from .crud_parser import CRUDParser
-        
-        crud_parser = CRUDParser()
-        return crud_parser.parse_delete(self.sql_query)
+        return _get_parser('crud').parse_delete(self.sql_query)
 
     def get_limit(self):
         """
@@ -306,72 +481,122 @@ class SQLParser:
         Returns:
             int or None: Valor numérico del límite, o None si no hay cláusula LIMIT.
         """
-        # Normalizar la consulta
-        query = " " + self.sql_query.strip() + " "
-        
-        # Expresión regular para extraer la cláusula LIMIT
-        pattern = r'\sLIMIT\s+(\d+)(?:\s|;|$)'
-        match = re.search(pattern, query, re.IGNORECASE)
-        
-        if match:
-            limit_str = match.group(1).strip()
+        return self._analysis()[2]
+    
+    def _extract_limit(self):
+        """Calcula el valor de LIMIT (ver get_limit)."""
+        # Se trabaja sobre la consulta en mayúsculas: los dígitos no cambian
+        # y los patrones no necesitan IGNORECASE
+        sql = self.sql_upper
+        limit_str = None
+        
+        # Camino rápido: LIMIT casi siempre está al final, buscar desde la derecha
+        i = sql.rfind("LIMIT")
+        if i >= 0 and (i == 0 or sql[i - 1].isspace()):
+            n = len(sql)
+            start = i + 5
+            while start < n and sql[start].isspace():
+                start += 1
+            end = start
+            while end < n and sql[end].isdecimal():
+                end += 1
+            if start > i + 5 and end > start and (end == n or sql[end].isspace() or sql[end] == ';'):
+                limit_str = sql[start:end]
+        
+        if limit_str is None:
+            # Caso ambiguo: usar la expresión regular
+            match = _LIMIT_RE_CS.search(sql)
+            if match:
+                limit_str = match.group(1)
+        
+        if limit_str is not None:
             try:
                 limit = int(limit_str)
-                logger.info(f"Límite extraído: {limit}")
+                logger.info("Límite extraído: %s", limit)
                 return limit
             except ValueError:
-                logger.error(f"No se pudo convertir el límite '{limit_str}' a entero")
+                logger.error("No se pudo convertir el límite '%s' a entero", limit_str)
         
         logger.info("No se encontró cláusula LIMIT en la consulta")
         return None
 
+    @classmethod
+    def parse_many(cls, queries, workers=None):
+        """
+        Analiza un lote de consultas repartiéndolo entre varios procesos,
+        ya que el análisis es trabajo de CPU y con hilos no escala por el GIL.
+        
+        Args:
+            queries (list): Consultas SQL a analizar
+            workers (int, optional): Número de procesos (por defecto, uno por CPU;
+                los lotes de menos de _PARALLEL_MIN_BATCH consultas se analizan
+                en el proceso actual)
+            
+        Returns:
+            list: Un diccionario {"type", "table", "limit"} por consulta, en el mismo orden
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+        if workers is None and len(queries) < _PARALLEL_MIN_BATCH:
+            # Arrancar un pool de procesos cuesta más que analizar un lote pequeño
+            workers = 1
+        # Nunca más procesos que consultas
+        workers = min(workers or os.cpu_count() or 1, len(queries))
+        logger.info("Analizando lote de %d consultas con %d procesos", len(queries), workers)
+        if workers == 1:
+            return [_summarize(query) for query in queries]
+        
+        chunksize = max(1, len(queries) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_summarize, queries, chunksize=chunksize))
+    
     # =================== 🆕 NUEVOS MÉTODOS AGREGADOS ===================
     
     # --- Lazy Loading de Parsers ---
     
     def _get_function_parser(self):
         """Obtiene el parser de funciones (lazy loading)."""
-        if not self._function_parser:
-            try:
-                from .function_parser import FunctionParser
-                self._function_parser = FunctionParser()
-            except ImportError:
-                logger.warning("FunctionParser no disponible")
-                self._function_parser = None
-        return self._function_parser
+        return _get_parser('function')
     
     def _get_advanced_parser(self):
         """Obtiene el parser avanzado (lazy loading)."""
-        if not self._advanced_parser:
-            try:
-                from .advanced_parser import AdvancedParser
-                self._advanced_parser = AdvancedParser()
-            except ImportError:
-                logger.warning("AdvancedParser no disponible")
-                self._advanced_parser = None
-        return self._advanced_parser
+        return _get_parser('advanced')
     
     def _get_join_parser(self):
         """Obtiene el parser de JOINs (lazy loading)."""
-        if not self._join_parser:
-            try:
-                from .join_parser import JoinParser
-                self._join_parser = JoinParser()
-            except ImportError:
-                logger.warning("JoinParser no disponible")
-                self._join_parser = None
-        return self._join_parser
+        return _get_parser('join')
     
     def _get_formatter(self):
         """Obtiene el formateador de respuestas (lazy loading)."""
-        if not self._formatter:
-            try:
-                from .formatter import ResponseFormatter
-                self._formatter = ResponseFormatter()
-            except ImportError:
-                logger.warning("ResponseFormatter no disponible")
-                self._formatter = None
-        return self._formatter
+        return _get_parser('formatter')
+    
+    # --- Detección de características ---
+    
+    def _gather_features(self):
+        """
+        Obtiene todas las banderas de características con una sola llamada
+        a cada parser especializado, y las guarda en la caché de la instancia.
+        
+        Returns:
+            dict: Banderas has_functions, has_joins, has_distinct, has_having,
+            has_union y has_subquery
+        """
+        cache = self._cache
+        if 'features' not in cache:
+            features = {
+                "has_functions": False,
+                "has_joins": False,
+                "has_distinct": False,
+                "has_having": False,
+                "has_union": False,
+                "has_subquery": False
+            }
+            for parser in (_get_parser('function'), _get_parser('join'), _get_parser('advanced')):
+                if parser:
+                    features.update(parser.analyze(self.sql_query, self.sql_upper))
+            cache['features'] = features
+        return cache['features']
     
     # --- Métodos de Funciones SQL ---
     
@@ -382,10 +607,7 @@ class SQLParser:
         Returns:
             bool: True si hay funciones, False en caso contrario
         """
-        parser = self._get_function_parser()
-        if parser:
-            return parser.has_functions(self.sql_query)
-        return False
+        return self._gather_features()['has_functions']
     
     def get_functions(self):
         """
@@ -394,7 +616,7 @@ class SQLParser:
         Returns:
             list: Lista de funciones encontradas con sus traducciones
         """
-        parser = self._get_function_parser()
+        parser = _get_parser('function')
         if parser:
             return parser.parse_functions(self.sql_query)
         return []
@@ -406,7 +628,7 @@ class SQLParser:
         Returns:
             dict: Diccionario con funciones soportadas por categoría
         """
-        parser = self._get_function_parser()
+        parser = _get_parser('function')
         if parser:
             return parser.get_supported_functions()
         return {}
@@ -420,10 +642,7 @@ class SQLParser:
         Returns:
             bool: True si hay DISTINCT, False en caso contrario
         """
-        parser = self._get_advanced_parser()
-        if parser:
-            return parser.has_distinct(self.sql_query)
-        return False
+        return self._gather_features()['has_distinct']
     
     def get_distinct_info(self):
         """
@@ -432,7 +651,7 @@ class SQLParser:
         Returns:
             dict: Información sobre la consulta DISTINCT
         """
-        parser = self._get_advanced_parser()
+        parser = _get_parser('advanced')
         if parser:
             return parser.parse_distinct(self.sql_query)
         return {}
@@ -444,10 +663,7 @@ class SQLParser:
         Returns:
             bool: True si hay HAVING, False en caso contrario
         """
-        parser = self._get_advanced_parser()
-        if parser:
-            return parser.has_having(self.sql_query)
-        return False
+        return self._gather_features()['has_having']
     
     def get_having_clause(self):
         """
@@ -456,7 +672,7 @@ class SQLParser:
         Returns:
             dict: Condiciones HAVING en formato MongoDB
         """
-        parser = self._get_advanced_parser()
+        parser = _get_parser('advanced')
         if parser:
             return parser.parse_having(self.sql_query)
         return {}
@@ -468,10 +684,7 @@ class SQLParser:
         Returns:
             bool: True si hay UNION, False en caso contrario
         """
-        parser = self._get_advanced_parser()
-        if parser:
-            return parser.has_union(self.sql_query)
-        return False
+        return self._gather_features()['has_union']
     
     def get_union_info(self):
         """
@@ -480,7 +693,7 @@ class SQLParser:
         Returns:
             dict: Información sobre la consulta UNION
         """
-        parser = self._get_advanced_parser()
+        parser = _get_parser('advanced')
         if parser:
             return parser.parse_union(self.sql_query)
         return {}
@@ -492,10 +705,7 @@ class SQLParser:
         Returns:
             bool: True si hay subqueries, False en caso contrario
         """
-        parser = self._get_advanced_parser()
-        if parser:
-            return parser.has_subquery(self.sql_query)
-        return False
+        return self._gather_features()['has_subquery']
     
     def get_subqueries(self):
         """
@@ -504,7 +714,7 @@ class SQLParser:
         Returns:
             list: Lista de subqueries encontradas
         """
-        parser = self._get_advanced_parser()
+        parser = _get_parser('advanced')
         if parser:
             return parser.parse_subqueries(self.sql_query)
         return []
@@ -518,10 +728,7 @@ class SQLParser:
         Returns:
             bool: True si hay JOINs, False en caso contrario
         """
-        parser = self._get_join_parser()
-        if parser:
-            return parser.has_joins(self.sql_query)
-        return False
+        return self._gather_features()['has_joins']
     
     def get_joins(self):
         """
@@ -530,7 +737,7 @@ class SQLParser:
         Returns:
             list: Lista de JOINs encontrados con información detallada
         """
-        parser = self._get_join_parser()
+        parser = _get_parser('join')
         if parser:
             return parser.parse_joins(self.sql_query)
         return []
@@ -542,7 +749,7 @@ class SQLParser:
         Returns:
             dict: Información de la tabla principal
         """
-        parser = self._get_join_parser()
+        parser = _get_parser('join')
         if parser:
             return parser.get_main_table_from_query(self.sql_query)
         return None
@@ -554,7 +761,7 @@ class SQLParser:
         Returns:
             dict: Resultado de validación
         """
-        parser = self._get_join_parser()
+        parser = _get_parser('join')
         if parser:
             return parser.validate_join_query(self.sql_query)
         return {"is_valid": True, "issues": [], "warnings": []}
@@ -573,7 +780,7 @@ class SQLParser:
         Returns:
             dict: Respuesta formateada
         """
-        formatter = self._get_formatter()
+        formatter = _get_parser('formatter')
         if formatter:
             return formatter.format_success(data, metadata, execution_time)
         return {"success": True, "data": data}
@@ -590,7 +797,7 @@ class SQLParser:
         Returns:
             dict: Respuesta de error formateada
         """
-        formatter = self._get_formatter()
+        formatter = _get_parser('formatter')
         if formatter:
             return formatter.format_error(error, error_type, context)
         return {"success": False, "error": str(error)}
@@ -607,7 +814,7 @@ class SQLParser:
         Returns:
             dict: Resultado de traducción formateado
         """
-        formatter = self._get_formatter()
+        formatter = _get_parser('formatter')
         if formatter:
             return formatter.format_translation_result(
                 sql_query=self.sql_query,
@@ -628,15 +835,14 @@ class SQLParser:
         Returns:
             dict: Análisis de complejidad
         """
-        complexity_factors = {
-            "has_functions": self.has_functions(),
-            "has_joins": self.has_joins(),
-            "has_distinct": self.has_distinct(),
-            "has_having": self.has_having(),
-            "has_union": self.has_union(),
-            "has_subquery": self.has_subquery(),
-            "query_type": self.get_query_type()
-        }
+        cache = self._cache
+        if 'complexity' not in cache:
+            cache['complexity'] = self._compute_complexity()
+        return cache['complexity']
+    
+    def _compute_complexity(self):
+        """Calcula el análisis de complejidad (ver analyze_query_complexity)."""
+        complexity_factors = dict(self._gather_features(), query_type=self.get_query_type())
         
         # Calcular puntuación de complejidad
         score = 0
@@ -675,6 +881,11 @@ class SQLParser:
         Returns:
             dict: Diccionario completo con todas las características detectadas
         """
+        # Las banderas ya calculadas para la complejidad se reutilizan
+        factors = self.analyze_query_complexity()["factors"]
+        has_functions = factors["has_functions"]
+        has_joins = factors["has_joins"]
+        
         features = {
             "basic_info": {
                 "query_type": self.get_query_type(),
@@ -683,19 +894,19 @@ class SQLParser:
                 "has_limit": self.get_limit() is not None
             },
             "functions": {
-                "has_functions": self.has_functions(),
-                "function_list": self.get_functions() if self.has_functions() else []
+                "has_functions": has_functions,
+                "function_list": self.get_functions() if has_functions else []
             },
             "advanced_features": {
-                "has_distinct": self.has_distinct(),
-                "has_having": self.has_having(),
-                "has_union": self.has_union(),
-                "has_subquery": self.has_subquery()
+                "has_distinct": factors["has_distinct"],
+                "has_having": factors["has_having"],
+                "has_union": factors["has_union"],
+                "has_subquery": factors["has_subquery"]
             },
             "joins": {
-                "has_joins": self.has_joins(),
-                "join_list": self.get_joins() if self.has_joins() else [],
-                "join_validation": self.validate_joins() if self.has_joins() else None
+                "has_joins": has_joins,
+                "join_list": self.get_joins() if has_joins else [],
+                "join_validation": self.validate_joins() if has_joins else None
             }
         }
         
@@ -713,11 +924,11 @@ class SQLParser:
             table_name = self.get_table_name()
             
             # Extraer definición de columnas entre paréntesis
-            columns_match = re.search(r'CREATE\s+TABLE\s+\w+\s*\((.*)\)', self.sql_query, re.IGNORECASE | re.DOTALL)
-            if not columns_match:
+            columns_str = _extract_create_columns(self.sql_query)
+            if columns_str is None:
                 raise ValueError("No se encontró definición de columnas en CREATE TABLE")
             
-            columns_str = columns_match.group(1).strip()
+            columns_str = columns_str.strip()
             
             # Parsear columnas individuales
             columns = self.parse_columns_definition(columns_str)
@@ -735,11 +946,11 @@ class SQLParser:
                 'original_definition': columns_str
             }
             
-            logger.info(f"Información de CREATE TABLE extraída: {table_name} con {len(columns)} columnas")
+            logger.info("Información de CREATE TABLE extraída: %s con %d columnas", table_name, len(columns))
             return create_info
             
         except Exception as e:
-            logger.error(f"Error extrayendo información de CREATE TABLE: {e}")
+            logger.error("Error extrayendo información de CREATE TABLE: %s", e)
             return {
                 'table_name': self.get_table_name(),
                 'columns': [],
@@ -761,12 +972,9 @@ class SQLParser:
         column_definitions = self.split_columns(columns_str)
         
         for col_def in column_definitions:
-            col_def = col_def.strip()
-            if not col_def:
-                continue
-                
-            # Saltar constraints globales (PRIMARY KEY, FOREIGN KEY, etc.)
-            if any(keyword in col_def.upper() for keyword in ['PRIMARY KEY (', 'FOREIGN KEY', 'INDEX', 'KEY']):
+            # Saltar constraints globales (PRIMARY KEY (...), FOREIGN KEY, etc.).
+            # Solo se mira el inicio: 'id INT PRIMARY KEY' sigue siendo una columna.
+            if _SKIP_RE.match(col_def):
                 continue
             
             column_info = self.parse_single_column(col_def)
@@ -779,47 +987,46 @@ class SQLParser:
         """
         ✅ NUEVO: Divide columnas respetando paréntesis
         """
+        # Solo se visitan los delimitadores; cada columna es un corte del texto original
         columns = []
-        current_column = ""
-        paren_count = 0
-        
-        for char in columns_str:
-            if char == '(':
-                paren_count += 1
-            elif char == ')':
-                paren_count -= 1
-            elif char == ',' and paren_count == 0:
-                columns.append(current_column.strip())
-                current_column = ""
-                continue
-            
-            current_column += char
-        
-        if current_column.strip():
-            columns.append(current_column.strip())
-        
-        return columns
+        start = 0
+        depth = 0
+        
+        for match in _DELIM_RE.finditer(columns_str):
+            delim = match.group()
+            if delim == '(':
+                depth += 1
+            elif delim == ')':
+                depth -= 1
+            elif delim == ',' and depth == 0:
+                columns.append(columns_str[start:match.start()].strip())
+                start = match.end()
+        
+        columns.append(columns_str[start:].strip())
+        return [column for column in columns if column]
 
     def parse_single_column(self, col_def):
         """
         ✅ NUEVO: Parsea una sola columna
         """
         try:
-            parts = col_def.split()
+            # Solo se necesitan nombre y tipo: el resto queda sin dividir
+            parts = col_def.split(None, 2)
             if len(parts) < 2:
                 return None
             
             column_name = parts[0]
             data_type = parts[1]
             
-            # Extraer información adicional
-            is_primary_key = 'PRIMARY KEY' in col_def.upper()
-            is_not_null = 'NOT NULL' in col_def.upper()
-            is_unique = 'UNIQUE' in col_def.upper()
+            # Extraer información adicional en una sola pasada
+            flags = {match.lastgroup for match in _COL_FLAGS_RE.finditer(col_def)}
+            is_primary_key = 'primary_key' in flags
+            is_not_null = 'not_null' in flags
+            is_unique = 'unique' in flags
             
             # Extraer valor por defecto
             default_value = None
-            default_match = re.search(r'DEFAULT\s+(\S+)', col_def, re.IGNORECASE)
+            default_match = _DEFAULT_RE.search(col_def)
             if default_match:
                 default_value = default_match.group(1)
             
@@ -834,27 +1041,15 @@ class SQLParser:
             }
             
         except Exception as e:
-            logger.warning(f"Error parseando columna '{col_def}': {e}")
+            logger.warning("Error parseando columna '%s': %s", col_def, e)
             return None
 
     def map_sql_to_mongo_type(self, sql_type):
         """
         ✅ NUEVO: Mapea tipos SQL a MongoDB
         """
-        sql_type_upper = sql_type.upper()
-        
-        if 'INT' in sql_type_upper:
-            return 'int'
-        elif 'VARCHAR' in sql_type_upper or 'TEXT' in sql_type_upper:
-            return 'string'
-        elif 'DECIMAL' in sql_type_upper or 'FLOAT' in sql_type_upper or 'DOUBLE' in sql_type_upper:
-            return 'number'
-        elif 'BOOLEAN' in sql_type_upper or 'BOOL' in sql_type_upper:
-            return 'bool'
-        elif 'DATE' in sql_type_upper or 'TIMESTAMP' in sql_type_upper:
-            return 'date'
-        else:
-            return 'mixed'
+        type_match = _TYPE_RE.search(sql_type)
+        return _TYPE_MAP[type_match.group().upper()] if type_match else 'mixed'
 
     def extract_constraints(self, columns_str):
         """
@@ -868,13 +1063,13 @@ class SQLParser:
         }
         
         # Buscar PRIMARY KEY
-        pk_match = re.search(r'PRIMARY\s+KEY\s*\(([^)]+)\)', columns_str, re.IGNORECASE)
+        pk_match = _PRIMARY_KEY_RE.search(columns_str)
         if pk_match:
             pk_fields = [field.strip() for field in pk_match.group(1).split(',')]
             constraints['primary_keys'] = pk_fields
         
         # Buscar FOREIGN KEY
-        fk_matches = re.finditer(r'FOREIGN\s+KEY\s*\(([^)]+)\)\s+REFERENCES\s+(\w+)\s*\(([^)]+)\)', columns_str, re.IGNORECASE)
+        fk_matches = _FOREIGN_KEY_RE.finditer(columns_str)
         for fk_match in fk_matches:
             constraints['foreign_keys'].append({
                 'columns': [col.strip() for col in fk_match.group(1).split(',')],
@@ -882,4 +1077,68 @@ class SQLParser:
                 'referenced_columns': [col.strip() for col in fk_match.group(3).split(',')]
             })
         
-        return constraints
\ No newline at end of file
+        return constraints
+
+
+# Parsers especializados compartidos (sin estado), creados en el primer uso.
+# La importación es perezosa para evitar dependencias circulares.
+_PARSER_CLASSES = {
+    'where': ('where_parser', 'WhereParser'),
+    'select': ('select_parser', 'SelectParser'),
+    'crud': ('crud_parser', 'CRUDParser'),
+    'function': ('function_parser', 'FunctionParser'),
+    'advanced': ('advanced_parser', 'AdvancedParser'),
+    'join': ('join_parser', 'JoinParser'),
+    'formatter': ('formatter', 'ResponseFormatter'),
+}
+_PARSERS = {}
+
+
+def _get_parser(name):
+    """
+    Obtiene la instancia compartida de un parser especializado.
+    
+    Args:
+        name (str): Clave del parser en _PARSER_CLASSES
+        
+    Returns:
+        object or None: Instancia del parser, o None si no está disponible
+    """
+    parser = _PARSERS.get(name)
+    if parser is None:
+        module_name, class_name = _PARSER_CLASSES[name]
+        try:
+            module = importlib.import_module('.' + module_name, __package__)
+        except ImportError:
+            logger.warning("%s no disponible", class_name)
+            return None
+        parser = _PARSERS[name] = getattr(module, class_name)()
+    return parser
+
+
+def _summarize(sql_query):
+    """
+    Resumen de una consulta para SQLParser.parse_many (ejecutado en cada proceso).
+    
+    Args:
+        sql_query (str): Consulta SQL
+        
+    Returns:
+        dict: Tipo de consulta, tabla y valor de LIMIT
+    """
+    query_type, table_name, limit = SQLParser(sql_query)._analysis()
+    return {"type": query_type, "table": table_name, "limit": limit}
+
+
+@lru_cache(maxsize=512)
+def _sqlparse_cached(sql_query):
+    """
+    sqlparse.parse memoizado por texto de consulta (el resultado solo se lee).
+    
+    Args:
+        sql_query (str): Consulta SQL
+        
+    Returns:
+        tuple: Sentencias analizadas por sqlparse
+    """
+    return sqlparse.parse(sql_query)
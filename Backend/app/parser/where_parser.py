@@ -1,15 +1,64 @@
 import re
+import sys
+import copy
 import logging
+from functools import lru_cache
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+# Patrones precompilados al cargar el módulo (se usan en cada consulta).
+# WHERE se ancla al inicio o a un espacio, sin rodear la consulta de espacios
+_WHERE_RE = re.compile(
+    r'(?:^|\s)WHERE\s+(.*?)(?=\s+GROUP\s+BY|\s+HAVING|\s+ORDER\s+BY|\s+LIMIT|\s+OFFSET|\s*;|\s*$)',
+    re.IGNORECASE | re.DOTALL)
+_BETWEEN_RE = re.compile(r'([\w.]+)\s+BETWEEN\s+(.*?)\s+AND\s+(.*?)(?:\s*;|\s*$)', re.IGNORECASE)
+_IN_RE = re.compile(r'([\w.]+)\s+IN\s+\((.*?)\)', re.IGNORECASE)
+_NOT_IN_RE = re.compile(r'([\w.]+)\s+NOT\s+IN\s+\((.*?)\)', re.IGNORECASE)
+_LIKE_RE = re.compile(r'([\w.]+)\s+LIKE\s+(.*?)(?:\s*;|\s*$)', re.IGNORECASE)
+_IS_NULL_RE = re.compile(r'([\w.]+)\s+IS\s+NULL(?:\s*;|\s*$)', re.IGNORECASE)
+_IS_NOT_NULL_RE = re.compile(r'([\w.]+)\s+IS\s+NOT\s+NULL(?:\s*;|\s*$)', re.IGNORECASE)
+
+# Piezas de un patrón LIKE: carácter escapado, comodines % (agrupados) y texto
+# (que puede contener el comodín _)
+_LIKE_TOKEN_RE = re.compile(r'\\(.)|(%+)|([^%\\]+|\\)', re.DOTALL)
+# re.escape no escapa "_", así que el comodín se traduce después de escapar el texto
+_LIKE_UNDERSCORE_TABLE = str.maketrans({"_": "."})
+
+# Operadores de comparación estándar; en la alternancia los de dos caracteres van primero
+_COMPARISON_OPERATORS = {
+    ">=": "$gte",
+    "<=": "$lte",
+    "<>": "$ne",
+    "!=": "$ne",
+    "=": "$eq",
+    ">": "$gt",
+    "<": "$lt"
+}
+_COMPARISON_RE = re.compile(r'>=|<=|<>|!=|=|>|<')
+
+# Un valor de una lista separada por comas: cadena entre comillas o texto hasta la coma
+_VALUE_TOKEN_RE = re.compile(r"""\s*('[^'\\]*(?:\\.[^'\\]*)*'|"[^"\\]*(?:\\.[^"\\]*)*"|[^,]*[^,\s])\s*(?:,|$)""")
+
+# Clasificación de valores literales por su primer carácter
+_QUOTE_CHARS = frozenset("'\"")
+_NUM_STARTS = frozenset("0123456789.+-")
+_KEYWORD_STARTS = frozenset("nNtTfF")
+_KEYWORD_VALUES = {"null": None, "true": True, "false": False}
+
+# Elementos que delimitan los operadores lógicos de nivel superior: cadenas entre
+# comillas (se saltan enteras), paréntesis y AND/OR/BETWEEN rodeados de espacios
+_TOP_LEVEL_TOKEN_RE = re.compile(r"""'[^']*'|"[^"]*"|[()]|\s(AND|OR|BETWEEN)(?=\s)""", re.IGNORECASE)
+
 class WhereParser:
     """
     Parser especializado para cláusulas WHERE de SQL.
     Analiza condiciones WHERE y las convierte a formato MongoDB.
     """
     
+    # Sin estado: sin __dict__ por instancia
+    __slots__ = ()
+    
     def parse(self, query):
         """
         Analiza la cláusula WHERE de una consulta SQL.
@@ -20,7 +69,16 @@ class WhereParser:
         Returns:
             dict: Diccionario con las condiciones en formato MongoDB
         """
-        logger.info(f"Analizando cláusula WHERE de consulta: {query}")
+        # Sin WHERE no hay condiciones: ni caché ni copia
+        if "WHERE" not in query.upper():
+            return {}
+        
+        # El resultado memoizado se comparte, así que se entrega una copia
+        return copy.deepcopy(_parse_where(query))
+    
+    def _parse_impl(self, query):
+        """Analiza la cláusula WHERE sin memoizar (ver parse)."""
+        logger.info("Analizando cláusula WHERE de consulta: %s", query)
         
         # Extraer la parte WHERE
         where_clause = self.extract_where_clause(query)
@@ -32,7 +90,7 @@ class WhereParser:
         conditions = {}
         self._parse_conditions(where_clause, conditions)
         
-        logger.info(f"Condiciones WHERE traducidas: {conditions}")
+        logger.info("Condiciones WHERE traducidas: %s", conditions)
         return conditions
     
 
@@ -40,11 +98,12 @@ class WhereParser:
         """
         🔧 MÉTODO CORREGIDO: Extrae WHERE sin incluir punto y coma
         """
-        query = " " + query.strip() + " "
+        # Sin la palabra WHERE no hay nada que extraer: se evita la regex
+        if "WHERE" not in query.upper():
+            return None
         
         # Regex corregido que excluye el punto y coma
-        pattern = r'\sWHERE\s+(.*?)(?:\s+GROUP\s+BY|\s+HAVING|\s+ORDER\s+BY|\s+LIMIT|\s+OFFSET|\s*;|\s*$)'
-        match = re.search(pattern, query, re.IGNORECASE | re.DOTALL)
+        match = _WHERE_RE.search(query)
         
         if match:
             where_clause = match.group(1).strip()
@@ -53,7 +112,7 @@ class WhereParser:
             if where_clause.endswith(';'):
                 where_clause = where_clause[:-1].strip()
             
-            logger.info(f"Cláusula WHERE extraída y limpia: '{where_clause}'")
+            logger.info("Cláusula WHERE extraída y limpia: '%s'", where_clause)
             return where_clause
         
         return None
@@ -67,40 +126,35 @@ class WhereParser:
             conditions_str (str): String con las condiciones
             result (dict): Diccionario donde se almacenarán las condiciones
         """
-        # Normalizar la condición
-        conditions_str = conditions_str.strip()
-        
-        # Verificar si hay operadores lógicos a nivel superior
-        if self._has_top_level_operator(conditions_str, "OR"):
-            # Manejar condiciones OR
-            parts = self._split_by_top_level_operator(conditions_str, "OR")
-            or_conditions = []
-            
-            for part in parts:
-                part_dict = {}
-                self._parse_conditions(part.strip(), part_dict)
-                if part_dict:
-                    or_conditions.append(part_dict)
-            
-            if or_conditions:
-                result["$or"] = or_conditions
-            return
-            
-        if self._has_top_level_operator(conditions_str, "AND"):
-            # Manejar condiciones AND
-            parts = self._split_by_top_level_operator(conditions_str, "AND")
-            
-            for part in parts:
-                sub_condition = {}
-                self._parse_conditions(part.strip(), sub_condition)
-                # Mezclar condiciones AND en el resultado principal
-                result.update(sub_condition)
-            return
+        # Recorrido iterativo: cada elemento es (texto, diccionario destino)
+        stack = [(conditions_str, result)]
+        # Listas $or pendientes de depurar, en el orden en que se crearon
+        or_lists = []
         
-        # Si llegamos aquí, es una condición simple
-        self._parse_simple_condition(conditions_str, result)
-
-
+        while stack:
+            text, target = stack.pop()
+            
+            # Operador lógico de nivel superior y partes, en una sola pasada
+            operator, parts = self._tokenize_top_level(text.strip())
+            if operator == "OR":
+                # Manejar condiciones OR: un diccionario por alternativa
+                or_conditions = [{} for _ in parts]
+                target["$or"] = or_conditions
+                or_lists.append((target, or_conditions))
+                stack.extend(zip(reversed(parts), reversed(or_conditions)))
+            elif operator == "AND":
+                # Manejar condiciones AND: se mezclan directamente en el destino,
+                # en orden, como hacía result.update con cada subcondición
+                stack.extend((part, target) for part in reversed(parts))
+            else:
+                # Condición simple (sin los paréntesis que la rodeen)
+                self._parse_simple_condition(parts[0], target)
+        
+        # Quitar las alternativas vacías, de dentro hacia fuera, y los $or sin ninguna
+        for target, or_conditions in reversed(or_lists):
+            or_conditions[:] = [condition for condition in or_conditions if condition]
+            if not or_conditions and target.get("$or") is or_conditions:
+                del target["$or"]
     
     def _parse_simple_condition(self, condition_str, result):
         """
@@ -110,30 +164,21 @@ class WhereParser:
             condition_str (str): String con la condición simple
             result (dict): Diccionario donde se almacenará la condición
         """
-        logger.debug(f"Parseando condición simple: '{condition_str}'")
+        logger.debug("Parseando condición simple: '%s'", condition_str)
         
         # 🆕 LIMPIEZA INICIAL: Remover punto y coma de toda la condición
         condition_str = condition_str.strip()
         if condition_str.endswith(';'):
             condition_str = condition_str[:-1].strip()
         
-        # Operadores de comparación estándar
-        operators = {
-            ">=": "$gte",
-            "<=": "$lte", 
-            "<>": "$ne",
-            "!=": "$ne",
-            "=": "$eq",
-            ">": "$gt",
-            "<": "$lt"
-        }
-        
-        # Manejar operadores especiales PRIMERO
+        # Manejar operadores especiales PRIMERO. La condición se pasa a mayúsculas
+        # una sola vez y cada patrón solo se aplica si aparece su palabra clave
+        condition_upper = condition_str.upper()
         
         # BETWEEN
-        between_match = re.search(r'([\w.]+)\s+BETWEEN\s+(.*?)\s+AND\s+(.*?)(?:\s*;|\s*$)', condition_str, re.IGNORECASE)
+        between_match = "BETWEEN" in condition_upper and _BETWEEN_RE.search(condition_str)
         if between_match:
-            field = between_match.group(1).strip()
+            field = sys.intern(between_match.group(1))
             min_val_str = between_match.group(2).strip()
             max_val_str = between_match.group(3).strip()
             
@@ -142,14 +187,15 @@ class WhereParser:
             max_val = self._parse_value(self._clean_value(max_val_str))
             
             result[field] = {"$gte": min_val, "$lte": max_val}
-            logger.debug(f"BETWEEN parseado: {field} BETWEEN {min_val} AND {max_val}")
+            logger.debug("BETWEEN parseado: %s BETWEEN %s AND %s", field, min_val, max_val)
             return
         
-        # IN
-        in_match = re.search(r'([\w.]+)\s+IN\s+\((.*?)\)', condition_str, re.IGNORECASE)
-        if in_match:
-            field = in_match.group(1).strip()
-            values_str = in_match.group(2).strip()
+        # NOT IN - Corregido para usar $nin (antes que IN, que también coincidiría)
+        has_in = "IN" in condition_upper
+        not_in_match = has_in and "NOT" in condition_upper and _NOT_IN_RE.search(condition_str)
+        if not_in_match:
+            field = sys.intern(not_in_match.group(1))
+            values_str = not_in_match.group(2).strip()
             
             # 🔧 LIMPIAR CADA VALOR EN LA LISTA
             values = []
@@ -158,15 +204,15 @@ class WhereParser:
                 parsed_value = self._parse_value(cleaned_value)
                 values.append(parsed_value)
             
-            result[field] = {"$in": values}
-            logger.debug(f"IN parseado: {field} IN {values}")
+            result[field] = {"$nin": values}
+            logger.debug("NOT IN parseado: %s NOT IN %s", field, values)
             return
         
-        # NOT IN - Corregido para usar $nin
-        not_in_match = re.search(r'([\w.]+)\s+NOT\s+IN\s+\((.*?)\)', condition_str, re.IGNORECASE)
-        if not_in_match:
-            field = not_in_match.group(1).strip()
-            values_str = not_in_match.group(2).strip()
+        # IN
+        in_match = has_in and _IN_RE.search(condition_str)
+        if in_match:
+            field = sys.intern(in_match.group(1))
+            values_str = in_match.group(2).strip()
             
             # 🔧 LIMPIAR CADA VALOR EN LA LISTA
             values = []
@@ -175,14 +221,14 @@ class WhereParser:
                 parsed_value = self._parse_value(cleaned_value)
                 values.append(parsed_value)
             
-            result[field] = {"$nin": values}
-            logger.debug(f"NOT IN parseado: {field} NOT IN {values}")
+            result[field] = {"$in": values}
+            logger.debug("IN parseado: %s IN %s", field, values)
             return
         
         # LIKE
-        like_match = re.search(r'([\w.]+)\s+LIKE\s+(.*?)(?:\s*;|\s*$)', condition_str, re.IGNORECASE)
+        like_match = "LIKE" in condition_upper and _LIKE_RE.search(condition_str)
         if like_match:
-            field = like_match.group(1).strip()
+            field = sys.intern(like_match.group(1))
             pattern_str = like_match.group(2).strip()
             
             # 🔧 LIMPIAR PATRÓN
@@ -195,50 +241,82 @@ class WhereParser:
                 pattern = pattern_str
             
             # Convertir patrón SQL a regex MongoDB
-            mongo_pattern = pattern.replace("%", ".*").replace("_", ".")
+            mongo_pattern = self._like_to_mongo(pattern)
             result[field] = {"$regex": mongo_pattern, "$options": "i"}
-            logger.debug(f"LIKE parseado: {field} LIKE '{pattern}' -> regex: {mongo_pattern}")
+            logger.debug("LIKE parseado: %s LIKE '%s' -> regex: %s", field, pattern, mongo_pattern)
             return
         
         # IS NULL
-        is_null_match = re.search(r'([\w.]+)\s+IS\s+NULL(?:\s*;|\s*$)', condition_str, re.IGNORECASE)
+        has_null = "NULL" in condition_upper
+        is_null_match = has_null and _IS_NULL_RE.search(condition_str)
         if is_null_match:
-            field = is_null_match.group(1).strip()
+            field = sys.intern(is_null_match.group(1))
             result[field] = {"$exists": False}
-            logger.debug(f"IS NULL parseado: {field}")
+            logger.debug("IS NULL parseado: %s", field)
             return
         
         # IS NOT NULL
-        is_not_null_match = re.search(r'([\w.]+)\s+IS\s+NOT\s+NULL(?:\s*;|\s*$)', condition_str, re.IGNORECASE)
+        is_not_null_match = has_null and _IS_NOT_NULL_RE.search(condition_str)
         if is_not_null_match:
-            field = is_not_null_match.group(1).strip()
+            field = sys.intern(is_not_null_match.group(1))
             result[field] = {"$exists": True}
-            logger.debug(f"IS NOT NULL parseado: {field}")
+            logger.debug("IS NOT NULL parseado: %s", field)
             return
         
-        # Operadores de comparación estándar
-        for op in sorted(operators.keys(), key=len, reverse=True):
-            if op in condition_str:
-                parts = condition_str.split(op, 1)
-                if len(parts) == 2:
-                    field = parts[0].strip()
-                    value_str = parts[1].strip()
-                    
-                    # 🔧 CRÍTICO: LIMPIAR EL VALOR ANTES DE PARSEARLO
-                    cleaned_value_str = self._clean_value(value_str)
-                    value = self._parse_value(cleaned_value_str)
-                    
-                    # Si el operador es '=', podemos usar el valor directamente en MongoDB
-                    if op == "=":
-                        result[field] = value
-                    else:
-                        result[field] = {operators[op]: value}
-                    
-                    logger.debug(f"Condición parseada: {field} {op} '{cleaned_value_str}' -> {value}")
-                    return
-        
-        logger.warning(f"No se pudo analizar la condición: {condition_str}")
+        # Operadores de comparación estándar: el primero que aparece (el más largo en esa posición)
+        op_match = _COMPARISON_RE.search(condition_str)
+        if op_match:
+            op = op_match.group()
+            field = sys.intern(condition_str[:op_match.start()].strip())
+            value_str = condition_str[op_match.end():].strip()
+            
+            # 🔧 CRÍTICO: LIMPIAR EL VALOR ANTES DE PARSEARLO
+            cleaned_value_str = self._clean_value(value_str)
+            value = self._parse_value(cleaned_value_str)
+            
+            # Si el operador es '=', podemos usar el valor directamente en MongoDB
+            if op == "=":
+                result[field] = value
+            else:
+                result[field] = {_COMPARISON_OPERATORS[op]: value}
+            
+            logger.debug("Condición parseada: %s %s '%s' -> %s", field, op, cleaned_value_str, value)
+            return
+        
+        logger.warning("No se pudo analizar la condición: %s", condition_str)
 
+    def _like_to_mongo(self, pattern):
+        """
+        Convierte un patrón LIKE de SQL en una expresión regular para MongoDB.
+        
+        El texto literal se escapa, cada grupo de % se convierte en un único
+        '.*?' y el patrón se ancla con ^ y $ salvo que empiece o termine por %.
+        Así la regex no tiene cuantificadores anidados ni contiguos y se evalúa
+        en tiempo lineal.
+        
+        Args:
+            pattern (str): Patrón LIKE sin comillas
+            
+        Returns:
+            str: Expresión regular equivalente
+        """
+        parts = []
+        for escaped, wildcard, literal in _LIKE_TOKEN_RE.findall(pattern):
+            if wildcard:
+                parts.append(None)
+            elif escaped:
+                parts.append(re.escape(escaped))
+            else:
+                parts.append(re.escape(literal).translate(_LIKE_UNDERSCORE_TABLE))
+        
+        # Un % al principio o al final equivale a no anclar ese extremo
+        prefix = "" if parts and parts[0] is None else "^"
+        suffix = "" if parts and parts[-1] is None else "$"
+        start = 0 if prefix else 1
+        end = len(parts) if suffix else len(parts) - 1
+        
+        return prefix + "".join(".*?" if part is None else part for part in parts[start:end]) + suffix
+    
     def _clean_value(self, value_str):
         """
         🆕 NUEVO: Método auxiliar para limpiar valores individuales
@@ -262,82 +340,104 @@ class WhereParser:
                     (cleaned.startswith('"') and cleaned.count('"') >= 2)):
                 cleaned = cleaned[:-1].strip()
         
-        logger.debug(f"Valor limpio: '{value_str}' -> '{cleaned}'")
+        logger.debug("Valor limpio: '%s' -> '%s'", value_str, cleaned)
         return cleaned 
 
 
 
-    def _has_top_level_operator(self, text, operator):
+    def _scan_top_level(self, text):
         """
-        Verifica si hay un operador específico a nivel superior (fuera de paréntesis).
+        Localiza en una sola pasada los operadores AND/OR de nivel superior
+        (fuera de paréntesis y de cadenas entre comillas). El AND que cierra
+        un BETWEEN no se considera separador.
         
         Args:
             text (str): Texto a analizar
-            operator (str): Operador a buscar (AND/OR)
             
         Returns:
-            bool: True si hay operador a nivel superior, False en caso contrario
+            list: Tuplas (operador, posición) con la posición del espacio previo al operador
         """
-        pattern = r'\s' + operator + r'\s'
+        hits = []
         level = 0
+        in_between = False
         
-        for i in range(len(text) - len(operator)):
-            if text[i] == '(':
+        for match in _TOP_LEVEL_TOKEN_RE.finditer(text):
+            token = match.group()
+            if token == '(':
                 level += 1
-            elif text[i] == ')':
+            elif token == ')':
                 level -= 1
-            elif level == 0 and re.match(pattern, text[i:i+len(operator)+2], re.IGNORECASE):
-                return True
+            elif level == 0 and match.group(1):
+                operator = match.group(1).upper()
+                if operator == "BETWEEN":
+                    in_between = True
+                elif operator == "AND" and in_between:
+                    in_between = False
+                else:
+                    hits.append((operator, match.start()))
         
-        return False
+        return hits
     
-    def _split_by_top_level_operator(self, text, operator):
+    def _tokenize_top_level(self, text):
+        """
+        Determina el operador lógico de nivel superior y divide el texto por él.
+        OR tiene menor precedencia que AND, así que se divide primero por OR.
+        Si no hay operadores y todo el texto está entre paréntesis, se analiza
+        su contenido.
+        
+        Args:
+            text (str): Texto a analizar
+            
+        Returns:
+            tuple: ('OR' | 'AND' | None, lista de partes)
+        """
+        hits = self._scan_top_level(text)
+        for operator in ("OR", "AND"):
+            if any(op == operator for op, _ in hits):
+                return operator, self._split_by_top_level_operator(text, operator, hits)
+        
+        if text.startswith('(') and text.endswith(')'):
+            # Comprobar que el primer paréntesis se cierra justo al final
+            level = 0
+            for match in _TOP_LEVEL_TOKEN_RE.finditer(text, 0, len(text) - 1):
+                token = match.group()
+                if token == '(':
+                    level += 1
+                elif token == ')':
+                    level -= 1
+                    if level == 0:
+                        break
+            else:
+                return self._tokenize_top_level(text[1:-1].strip())
+        
+        return None, [text]
+    
+    def _split_by_top_level_operator(self, text, operator, hits=None):
         """
         Divide el texto por un operador específico a nivel superior.
         
         Args:
             text (str): Texto a dividir
             operator (str): Operador para dividir (AND/OR)
+            hits (list, optional): Resultado previo de _scan_top_level para el texto
             
         Returns:
             list: Lista de partes divididas
         """
-        result = []
-        current = ""
-        level = 0
-        i = 0
-        
-        op_pattern = r'\s' + operator + r'\s'
-        text = " " + text + " "  # Añadir espacios para facilitar la coincidencia
-        
-        while i < len(text):
-            if text[i] == '(':
-                level += 1
-                current += text[i]
-            elif text[i] == ')':
-                level -= 1
-                current += text[i]
-            elif level == 0 and i <= len(text) - len(operator) - 2:
-                # Verificar si esta parte coincide con el operador (con espacios)
-                part = text[i:i+len(operator)+2]
-                if re.match(op_pattern, part, re.IGNORECASE):
-                    # Encontramos el operador, guardamos la parte actual
-                    if current.strip():
-                        result.append(current.strip())
-                    current = ""
-                    # Saltar el operador
-                    i += len(operator)
-                else:
-                    current += text[i]
-            else:
-                current += text[i]
-            i += 1
-        
-        # Añadir la última parte si no está vacía
-        if current.strip():
-            result.append(current.strip())
+        if hits is None:
+            hits = self._scan_top_level(text)
         
-        return result
+        result = []
+        start = 0
+        for op, position in hits:
+            if op == operator:
+                result.append(text[start:position].strip())
+                # Saltar el espacio previo y el operador
+                start = position + 1 + len(operator)
+        result.append(text[start:].strip())
+        
+        # Descartar las partes vacías
+        return [part for part in result if part]
     
     def _split_values(self, values_str):
         """
@@ -351,23 +451,12 @@ class WhereParser:
         """
         if not values_str:
             return []
-            
-        values = []
-        current = ""
-        in_quotes = False
-        quote_char = None
-        
-        for char in values_str + ',':  # Añadir coma al final para capturar el último valor
-            if char in ["'", '"'] and (not in_quotes or char == quote_char):
-                in_quotes = not in_quotes
-                current += char
-            elif char == ',' and not in_quotes:
-                values.append(current.strip())
-                current = ""
-            else:
-                current += char
         
-        return values
+        # Sin comillas no hay comas protegidas: basta con split, que trabaja en C
+        if "'" not in values_str and '"' not in values_str:
+            return [value for value in map(str.strip, values_str.split(",")) if value]
+        
+        return [match.group(1) for match in _VALUE_TOKEN_RE.finditer(values_str)]
     
     def _parse_value(self, value_str):
         """
@@ -384,34 +473,59 @@ class WhereParser:
             
         # Limpiar espacios
         value_str = value_str.strip()
+        if not value_str:
+            return value_str
         
-        # Si está entre comillas, es una cadena
-        if (value_str.startswith("'") and value_str.endswith("'")) or \
-           (value_str.startswith('"') and value_str.endswith('"')):
-            return value_str[1:-1]
-        
-        # Si es NULL, devolver None
-        if value_str.upper() == "NULL":
-            return None
+        # Decidir el tipo por el primer carácter
+        first = value_str[0]
         
-        # Si es TRUE o FALSE, devolver booleano
-        if value_str.upper() == "TRUE":
-            return True
-        if value_str.upper() == "FALSE":
-            return False
+        # Si está entre comillas, es una cadena
+        if first in _QUOTE_CHARS:
+            if value_str[-1] == first:
+                return value_str[1:-1]
+            return value_str
         
-        # Si tiene punto decimal, intentar convertir a float
-        if "." in value_str:
-            try:
+        # Números: se comprueba la forma antes de convertir, para no lanzar
+        # excepciones con los valores que no lo son
+        if first in _NUM_STARTS:
+            body = value_str[1:] if first in "+-" else value_str
+            if body.isdecimal():
+                return int(value_str)
+            if "." in body and body.replace(".", "", 1).isdecimal():
                 return float(value_str)
+            # Formas menos comunes (1_000, notación científica...): try/except
+            # solo cuando la comprobación rápida no basta
+            try:
+                return int(value_str)
             except ValueError:
                 pass
+            if "." in body or "e" in body or "E" in body:
+                try:
+                    return float(value_str)
+                except ValueError:
+                    pass
+            return value_str
         
-        # Intentar convertir a entero
-        try:
-            return int(value_str)
-        except ValueError:
-            pass
+        # NULL, TRUE o FALSE (sin distinguir mayúsculas)
+        if first in _KEYWORD_STARTS:
+            lowered = value_str.lower()
+            if lowered in _KEYWORD_VALUES:
+                return _KEYWORD_VALUES[lowered]
         
         # Si no coincide con ningún tipo, devolver como string
-        return value_str
\ No newline at end of file
+        return value_str
+
+
+@lru_cache(maxsize=1024)
+def _parse_where(query):
+    """
+    Analiza la cláusula WHERE una sola vez por texto de consulta, de modo que
+    las consultas repetidas reutilizan el resultado.
+    
+    Args:
+        query (str): Consulta SQL completa
+        
+    Returns:
+        dict: Condiciones en formato MongoDB (no debe modificarse)
+    """
+    return WhereParser()._parse_impl(query)
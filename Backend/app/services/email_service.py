@@ -5,23 +5,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-class EmailService:
-    
-    @staticmethod
-    def send_reset_code(email, code, user_name=None):
-        """
-        Envía código de reset por email (simulado para testing)
-        """
-        try:
-            # ✅ VERSIÓN SIMULADA - En producción usar Flask-Mail o servicio real
-            logger.info(f"[EMAIL SIMULADO] Enviando código {code} a {email}")
-            
-            # Simular email enviado
-            email_content = f"""
+# Plantillas de los emails, preparadas una sola vez al cargar el módulo
+_RESET_TEMPLATE = """
 Para: {email}
 Asunto: Código de recuperación - SQL Translator
 
-Hola {user_name or 'Usuario'},
+Hola {user_name},
 
 Tu código de verificación para recuperar tu contraseña es:
 
@@ -33,9 +22,42 @@ Si no solicitaste este cambio, puedes ignorar este email de forma segura.
 
 Saludos,
 Equipo SQL-MongoDB Translator
-            """
+"""
+
+_PASSWORD_CHANGED_TEMPLATE = """
+Para: {email}
+Asunto: Contraseña actualizada - SQL Translator
+
+Hola {user_name},
+
+Tu contraseña ha sido actualizada exitosamente.
+
+Si no realizaste este cambio, contacta con soporte inmediatamente.
+
+Saludos,
+Equipo SQL-MongoDB Translator
+"""
+
+class EmailService:
+    
+    @staticmethod
+    def send_reset_code(email, code, user_name=None):
+        """
+        Envía código de reset por email (simulado para testing)
+        """
+        try:
+            # ✅ VERSIÓN SIMULADA - En producción usar Flask-Mail o servicio real
+            logger.info("[EMAIL SIMULADO] Enviando código %s a %s", code, email)
+            
+            # Simular email enviado (el texto solo se construye si se va a registrar)
+            if logger.isEnabledFor(logging.INFO):
+                email_content = _RESET_TEMPLATE.format_map({
+                    'email': email,
+                    'code': code,
+                    'user_name': user_name or 'Usuario',
+                })
+                logger.info("Email simulado enviado:\n%s", email_content)
             
-            logger.info(f"Email simulado enviado:\n{email_content}")
             return True
             
         except Exception as e:
@@ -48,23 +70,15 @@ Equipo SQL-MongoDB Translator
         Envía notificación de contraseña cambiada (simulado)
         """
         try:
-            logger.info(f"[EMAIL SIMULADO] Notificación de cambio de contraseña a {email}")
+            logger.info("[EMAIL SIMULADO] Notificación de cambio de contraseña a %s", email)
             
-            email_content = f"""
-Para: {email}
-Asunto: Contraseña actualizada - SQL Translator
-
-Hola {user_name or 'Usuario'},
-
-Tu contraseña ha sido actualizada exitosamente.
-
-Si no realizaste este cambio, contacta con soporte inmediatamente.
-
-Saludos,
-Equipo SQL-MongoDB Translator
-            """
+            if logger.isEnabledFor(logging.INFO):
+                email_content = _PASSWORD_CHANGED_TEMPLATE.format_map({
+                    'email': email,
+                    'user_name': user_name or 'Usuario',
+                })
+                logger.info("Notificación simulada enviada:\n%s", email_content)
             
-            logger.info(f"Notificación simulada enviada:\n{email_content}")
             return True
             
         except Exception as e:
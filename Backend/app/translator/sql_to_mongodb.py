@@ -21,6 +21,9 @@ class SQLToMongoDBTranslator:
         self.sql_parser = sql_parser
         # 🆕 Lista para almacenar advertencias durante la traducción
         self.warnings = []
+        # Resultados de los accesores del parser durante la traducción actual (ver _p)
+        self._cache = {}
+        self._cached_parser = None
     
     def translate(self, sql_query=None):
         """
@@ -41,8 +44,10 @@ class SQLToMongoDBTranslator:
         if not self.sql_parser:
             raise ValueError("No se ha proporcionado una consulta SQL ni un parser")
         
-        # 🆕 Limpiar advertencias anteriores
+        # 🆕 Limpiar advertencias y resultados de una traducción anterior
         self.warnings = []
+        self._cache = {}
+        self._cached_parser = self.sql_parser
         
         # 🆕 Analizar complejidad de la consulta
         complexity_info = self.sql_parser.analyze_query_complexity()
@@ -68,19 +73,41 @@ class SQLToMongoDBTranslator:
             raise ValueError(f"Tipo de consulta no soportado: {query_type}")
     
 
+    def _p(self, name):
+        """
+        Devuelve self.sql_parser.get_<name>() calculándolo una sola vez por
+        traducción: los métodos de traducción consultan varias veces los mismos
+        accesores (WHERE, funciones, ORDER BY, LIMIT...).
+        
+        Args:
+            name (str): Nombre del accesor sin el prefijo "get_" (p. ej. 'where_clause')
+            
+        Returns:
+            El resultado del accesor del parser
+        """
+        # Si el parser cambió sin pasar por translate(), descartar lo memoizado
+        if self._cached_parser is not self.sql_parser:
+            self._cache = {}
+            self._cached_parser = self.sql_parser
+        
+        cache = self._cache
+        if name not in cache:
+            cache[name] = getattr(self.sql_parser, 'get_' + name)()
+        return cache[name]
+    
     def translate_select(self):
         """
         Traduce una consulta SELECT a operaciones de MongoDB.
         ✅ CORREGIDO con detección mejorada de agregaciones.
         """
         # Obtener el nombre de la tabla (colección en MongoDB)
-        collection = self.sql_parser.get_table_name()
+        collection = self._p('table_name')
         
         # Obtener los campos a seleccionar
-        select_fields = self.sql_parser.get_select_fields()
+        select_fields = self._p('select_fields')
         
         # Obtener la cláusula WHERE
-        where_clause = self.sql_parser.get_where_clause()
+        where_clause = self._p('where_clause')
         
         # ✅ CORREGIDO: Verificar características avanzadas
         has_functions = self.sql_parser.has_functions()
@@ -89,12 +116,12 @@ class SQLToMongoDBTranslator:
         has_having = self.sql_parser.has_having() if hasattr(self.sql_parser, 'has_having') else False
         has_union = self.sql_parser.has_union() if hasattr(self.sql_parser, 'has_union') else False
         has_subquery = self.sql_parser.has_subquery() if hasattr(self.sql_parser, 'has_subquery') else False
-        has_order_by = bool(self.sql_parser.get_order_by())
+        has_order_by = bool(self._p('order_by'))
         
         # ✅ NUEVO: Detectar funciones de agregación específicamente
         has_aggregate = False
         if has_functions:
-            functions = self.sql_parser.get_functions()
+            functions = self._p('functions')
             # Buscar funciones de agregación
             aggregate_function_names = ['COUNT', 'SUM', 'AVG', 'MIN', 'MAX', 'GROUP_CONCAT']
             for func in functions:
@@ -107,7 +134,7 @@ class SQLToMongoDBTranslator:
         # ✅ NUEVO: Detectar GROUP BY
         has_group_by = False
         if hasattr(self.sql_parser, 'get_group_by'):
-            group_by = self.sql_parser.get_group_by()
+            group_by = self._p('group_by')
             has_group_by = len(group_by) > 0 if group_by else False
         
         logger.info(f"📊 Características detectadas - Agregaciones: {has_aggregate}, GROUP BY: {has_group_by}, ORDER BY: {has_order_by}")
@@ -143,17 +170,17 @@ class SQLToMongoDBTranslator:
         }
         
         # Obtener el nombre de la tabla (colección)
-        collection = self.sql_parser.get_table_name()
+        collection = self._p('table_name')
         if collection:
             result["collection"] = collection
         
         # Obtener cláusula WHERE
-        where_clause = self.sql_parser.get_where_clause()
+        where_clause = self._p('where_clause')
         if where_clause:
             result["query"] = where_clause
         
         # Obtener campos a seleccionar
-        select_fields = self.sql_parser.get_select_fields()
+        select_fields = self._p('select_fields')
         
         # Asegurarnos de que select_fields sea una lista
         if isinstance(select_fields, list):
@@ -179,7 +206,7 @@ class SQLToMongoDBTranslator:
                     result["projection"] = projection
         
         # ✅ CORREGIDO: Obtener ORDER BY
-        order_by = self.sql_parser.get_order_by()
+        order_by = self._p('order_by')
         if order_by:
             logger.info(f"🔍 ORDER BY detectado: {order_by}")
             
@@ -216,7 +243,7 @@ class SQLToMongoDBTranslator:
                     logger.error(f"❌ Error procesando ORDER BY: {e}")
         
         # Obtener LIMIT
-        limit = self.sql_parser.get_limit()
+        limit = self._p('limit')
         if limit is not None:
             logger.debug(f"Traduciendo LIMIT {limit} a MongoDB")
             result["limit"] = limit
@@ -240,10 +267,10 @@ class SQLToMongoDBTranslator:
         pipeline = []
         
         # Obtener el nombre de la tabla (colección)
-        collection = self.sql_parser.get_table_name()
+        collection = self._p('table_name')
         
         # 🆕 1. Etapa $match inicial (WHERE) - siempre primero para optimización
-        where_clause = self.sql_parser.get_where_clause()
+        where_clause = self._p('where_clause')
         if where_clause:
             pipeline.append({
                 "$match": where_clause
@@ -261,7 +288,7 @@ class SQLToMongoDBTranslator:
         
         # 🆕 4. Etapa $match para HAVING (después de $group)
         if self.sql_parser.has_having():
-            having_clause = self.sql_parser.get_having_clause()
+            having_clause = self._p('having_clause')
             if having_clause:
                 pipeline.append({
                     "$match": having_clause
@@ -274,7 +301,7 @@ class SQLToMongoDBTranslator:
         
         # ✅ 6. CORREGIDO: Etapa $sort para ORDER BY
         if hasattr(self.sql_parser, 'get_order_by'):
-            order_by = self.sql_parser.get_order_by()
+            order_by = self._p('order_by')
             if order_by:
                 logger.info(f"🔍 ORDER BY en aggregate detectado: {order_by}, tipo: {type(order_by)}")
                 
@@ -316,7 +343,7 @@ class SQLToMongoDBTranslator:
         
         # ✅ 7. CORREGIDO: Etapa $limit para LIMIT
         if hasattr(self.sql_parser, 'get_limit'):
-            limit = self.sql_parser.get_limit()
+            limit = self._p('limit')
             if limit is not None:
                 pipeline.append({
                     "$limit": limit
@@ -349,7 +376,7 @@ class SQLToMongoDBTranslator:
         pipeline = []
         
         # Obtener información de JOINs
-        joins = self.sql_parser.get_joins()
+        joins = self._p('joins')
         join_parser = self.sql_parser._get_join_parser()
         
         if not joins or not join_parser:
@@ -357,10 +384,10 @@ class SQLToMongoDBTranslator:
             return self._translate_select_aggregate()
         
         # Obtener tabla principal
-        collection = self.sql_parser.get_table_name()
+        collection = self._p('table_name')
         
         # 1. $match inicial para WHERE en tabla principal
-        where_clause = self.sql_parser.get_where_clause()
+        where_clause = self._p('where_clause')
         if where_clause:
             pipeline.append({"$match": where_clause})
         
@@ -375,7 +402,7 @@ class SQLToMongoDBTranslator:
         
         # 4. ORDER BY y LIMIT
         if hasattr(self.sql_parser, 'get_order_by'):
-            order_by = self.sql_parser.get_order_by()
+            order_by = self._p('order_by')
             if order_by:
                 sort_stage = {"$sort": {}}
                 for order_info in order_by:
@@ -385,7 +412,7 @@ class SQLToMongoDBTranslator:
                 pipeline.append(sort_stage)
         
         if hasattr(self.sql_parser, 'get_limit'):
-            limit = self.sql_parser.get_limit()
+            limit = self._p('limit')
             if limit is not None:
                 pipeline.append({"$limit": limit})
         
@@ -407,7 +434,7 @@ class SQLToMongoDBTranslator:
         Returns:
             dict: Información sobre cómo manejar UNION
         """
-        union_info = self.sql_parser.get_union_info()
+        union_info = self._p('union_info')
         
         if "error" in union_info:
             raise ValueError(f"Error procesando UNION: {union_info['error']}")
@@ -415,7 +442,7 @@ class SQLToMongoDBTranslator:
         # UNION en MongoDB requiere $unionWith (4.4+) o queries separadas
         return {
             "operation": "union",
-            "collection": self.sql_parser.get_table_name(),
+            "collection": self._p('table_name'),
             "union_type": "union_all" if union_info.get("union_all") else "union",
             "queries": union_info.get("queries", []),
             "warnings": self.warnings + [
@@ -447,7 +474,7 @@ class SQLToMongoDBTranslator:
         group_stage = None
         
         # Verificar si hay funciones de agregación
-        functions = self.sql_parser.get_functions()
+        functions = self._p('functions')
         aggregate_functions = []
         
         if functions:
@@ -499,7 +526,7 @@ class SQLToMongoDBTranslator:
         """
         ✅ CORREGIDO: Construye la etapa $project para agregaciones.
         """
-        functions = self.sql_parser.get_functions()
+        functions = self._p('functions')
         aggregate_functions = []
         
         if functions:
@@ -529,14 +556,14 @@ class SQLToMongoDBTranslator:
         Returns:
             dict: Etapa $project para JOINs
         """
-        select_fields = self.sql_parser.get_select_fields()
+        select_fields = self._p('select_fields')
         
         if not select_fields or any(f.get("field") == "*" for f in select_fields):
             # Para SELECT *, incluir campos principales y de JOINs
             project_stage = {"$project": {}}
             
             # Incluir campos de la tabla principal
-            main_table = self.sql_parser.get_table_name()
+            main_table = self._p('table_name')
             for field in ["_id"]:  # Incluir campos básicos
                 project_stage["$project"][field] = 1
             
@@ -603,10 +630,10 @@ class SQLToMongoDBTranslator:
             dict: Diccionario con la operación MongoDB
         """
         # Obtener el nombre de la tabla (colección)
-        collection = self.sql_parser.get_table_name()
+        collection = self._p('table_name')
         
         # Obtener los valores a insertar usando crud_parser
-        insert_values = self.sql_parser.get_insert_values()
+        insert_values = self._p('insert_values')
         
         if not insert_values:
             raise ValueError("No se pudieron extraer valores para insertar")
@@ -655,13 +682,13 @@ class SQLToMongoDBTranslator:
             dict: Diccionario con la operación MongoDB
         """
         # Obtener el nombre de la tabla (colección)
-        collection = self.sql_parser.get_table_name()
+        collection = self._p('table_name')
         
         # Obtener valores a actualizar
-        update_values = self.sql_parser.get_update_values()
+        update_values = self._p('update_values')
         
         # Obtener condición WHERE
-        where_clause = self.sql_parser.get_where_clause()
+        where_clause = self._p('where_clause')
         
         if not update_values:
             raise ValueError("No se pudieron extraer valores para actualizar")
@@ -683,10 +710,10 @@ class SQLToMongoDBTranslator:
             dict: Diccionario con la operación MongoDB
         """
         # Obtener el nombre de la tabla (colección)
-        collection = self.sql_parser.get_table_name()
+        collection = self._p('table_name')
         
         # Obtener condición WHERE
-        where_clause = self.sql_parser.get_where_clause()
+        where_clause = self._p('where_clause')
         
         return {
             "operation": "delete",
@@ -704,11 +731,11 @@ class SQLToMongoDBTranslator:
             dict: Diccionario con la operación MongoDB y esquema
         """
         # Obtener información detallada de CREATE TABLE
-        create_info = self.sql_parser.get_create_table_info()
+        create_info = self._p('create_table_info')
         
         if not create_info:
             # Fallback al método anterior si no hay DDL parser
-            collection = self.sql_parser.get_table_name()
+            collection = self._p('table_name')
             if not collection:
                 raise ValueError("No se pudo determinar el nombre de la colección")
             
@@ -819,7 +846,7 @@ class SQLToMongoDBTranslator:
             dict: Diccionario con la operación MongoDB
         """
         # Obtener el nombre de la tabla (colección)
-        collection = self.sql_parser.get_table_name()
+        collection = self._p('table_name')
         
         if not collection:
             raise ValueError("No se pudo determinar el nombre de la colección")
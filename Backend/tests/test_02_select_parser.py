@@ -52,6 +52,57 @@ class TestSelectParser:
         assert result["fields"][0]["alias"] == "name"
         assert result["fields"][1]["field"] == "precio"
         assert result["fields"][1]["alias"] == "price"
+        
+        # Probar alias sin AS y expresiones sin alias
+        sql = "SELECT COUNT(*) total, precio + impuesto FROM productos"
+        result = parser.parse(sql)
+        
+        assert result["fields"][0] == {"field": "COUNT(*)", "alias": "total"}
+        assert result["fields"][1] == {"field": "precio + impuesto"}
+    
+    def test_extract_functions(self):
+        """Prueba la extracción de funciones de agregación."""
+        parser = SelectParser()
+        
+        sql = "SELECT COUNT(*), SUM(ROUND(precio, 2)) AS total, nombre FROM productos"
+        fields = parser.parse(sql)["fields"]
+        
+        assert parser.has_aggregate_functions(fields)
+        assert parser.extract_functions(fields) == [
+            {"function": "count", "field": "*", "alias": "count_all"},
+            {"function": "sum", "field": "ROUND(precio, 2)", "alias": "total"}
+        ]
+        assert not parser.has_aggregate_functions([{"field": "nombre"}])
+    
+    def test_parse_columns_definition(self):
+        """Prueba que se omiten las restricciones de tabla pero no las columnas con PRIMARY KEY."""
+        parser = SelectParser()
+        
+        columns, has_primary_key = parser.parse_columns_definition(
+            "id INT PRIMARY KEY, nombre VARCHAR(50) NOT NULL, PRIMARY KEY (id), "
+            "CONSTRAINT fk FOREIGN KEY (a) REFERENCES b(c)"
+        )
+        
+        assert [col["name"] for col in columns] == ["id", "nombre"]
+        assert has_primary_key is True
+        assert columns[0]["is_primary_key"] is True
+        assert columns[1]["is_not_null"] is True
+        assert columns[1]["mongo_type"] == "string"
+    
+    def test_extract_constraints(self):
+        """Prueba la extracción de PRIMARY KEY y FOREIGN KEY de una definición de columnas."""
+        parser = SelectParser()
+        
+        columns_str = ("id INT, usuario_id INT, total DECIMAL(10,2), "
+                       "PRIMARY KEY (id), FOREIGN KEY (usuario_id) REFERENCES usuarios(id)")
+        constraints = parser.extract_constraints(columns_str)
+        
+        assert constraints["primary_keys"] == ["id"]
+        assert constraints["foreign_keys"] == [{
+            "columns": ["usuario_id"],
+            "referenced_table": "usuarios",
+            "referenced_columns": ["id"]
+        }]
     
 
     def test_select_to_mongodb_translation(self):
@@ -79,6 +130,25 @@ class TestSelectParser:
             # pero sigue siendo correcta funcionalmente
             print("Nota: No se encontró projection en el resultado, pero la prueba continúa")
 
+    def test_translator_memoizes_parser_accessors(self):
+        """Prueba que el traductor consulta cada accesor del parser una vez por traducción."""
+        calls = []
+        
+        class CountingParser(SQLParser):
+            def get_select_fields(self):
+                calls.append(self.sql_query)
+                return super().get_select_fields()
+        
+        translator = SQLToMongoDBTranslator(CountingParser("SELECT nombre, edad FROM usuarios"))
+        result = translator.translate()
+        assert result["projection"] == {"nombre": 1, "edad": 1}
+        assert len(calls) == 1
+        
+        # Una nueva consulta descarta los resultados de la anterior
+        result = translator.translate("SELECT precio FROM productos")
+        assert result["collection"] == "productos"
+        assert result["projection"] == {"precio": 1}
+    
     def test_actual_select_execution(self, users_collection, products_collection):
         """Prueba la ejecución real de SELECT en MongoDB."""
         # Consulta simple
@@ -7,7 +7,7 @@ import logging
 # Agregar el directorio raíz al PYTHONPATH
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.parser.where_parser import WhereParser
+from app.parser.where_parser import WhereParser, _parse_where
 from app.parser.sql_parser import SQLParser
 from app.translator.sql_to_mongodb import SQLToMongoDBTranslator
 
@@ -64,6 +64,11 @@ class TestWhereParser:
         sql = "SELECT * FROM usuarios WHERE rol <> 'usuario'"
         result = self.parser.parse(sql)
         assert result == {"rol": {"$ne": "usuario"}}
+        
+        # El operador es el primero que aparece, no el más largo de la condición
+        sql = "SELECT * FROM usuarios WHERE nota = '>=5'"
+        result = self.parser.parse(sql)
+        assert result == {"nota": ">=5"}
     
     def test_in_operator(self):
         """Prueba para el operador IN."""
@@ -121,6 +126,11 @@ class TestWhereParser:
             assert False, f"Formato no reconocido para NOT IN: {result}"
 
 
+    def test_not_in_uses_nin(self):
+        """Prueba que NOT IN no se confunde con IN."""
+        sql = "SELECT * FROM usuarios WHERE rol NOT IN ('usuario', 'invitado')"
+        assert self.parser.parse(sql) == {"rol": {"$nin": ["usuario", "invitado"]}}
+    
     def test_between_operator(self):
         """Prueba para el operador BETWEEN."""
         sql = "SELECT * FROM usuarios WHERE edad BETWEEN 20 AND 30"
@@ -149,7 +159,16 @@ class TestWhereParser:
         
         # Verificar que el patrón se convirtió correctamente
         pattern = result["email"]["$regex"]
-        assert pattern.endswith("@ejemplo.com")
+        assert pattern == r"@ejemplo\.com$"
+    
+    def test_like_to_mongo(self):
+        """Prueba la conversión de patrones LIKE a expresiones regulares ancladas."""
+        assert self.parser._like_to_mongo("ab_c%") == "^ab.c"
+        assert self.parser._like_to_mongo("%x%") == "x"
+        assert self.parser._like_to_mongo("a%%%%b") == "^a.*?b$"
+        assert self.parser._like_to_mongo("50\\%") == "^50%$"
+        assert self.parser._like_to_mongo("%") == ""
+        assert self.parser._like_to_mongo("") == "^$"
     
     def test_null_operators(self):
         """Prueba para los operadores IS NULL e IS NOT NULL."""
@@ -203,6 +222,48 @@ class TestWhereParser:
         assert "admin" in conditions_found
         assert "editor" in conditions_found
     
+    def test_parse_value(self):
+        """Prueba la conversión de valores literales a tipos de Python."""
+        values = ["'Ana'", '"Eva"', "12", "-3", "1.5", ".5", "1e3", "1_000", "1_0.5", "1.2.3",
+                  "12abc", "NULL", "true", "False", "nombre"]
+        assert [self.parser._parse_value(v) for v in values] == [
+            "Ana", "Eva", 12, -3, 1.5, 0.5, 1000.0, 1000, 10.5, "1.2.3", "12abc", None, True, False, "nombre"
+        ]
+    
+    def test_split_values(self):
+        """Prueba la división de listas de valores respetando comillas."""
+        assert self.parser._split_values("'admin', 'editor'") == ["'admin'", "'editor'"]
+        assert self.parser._split_values("1, 2,3") == ["1", "2", "3"]
+        assert self.parser._split_values("'a,b', \"c\"") == ["'a,b'", '"c"']
+        assert self.parser._split_values("") == []
+        
+        result = self.parser.parse("SELECT * FROM usuarios WHERE rol IN ('admin', 'editor')")
+        assert result == {"rol": {"$in": ["admin", "editor"]}}
+    
+    def test_query_without_where(self):
+        """Prueba que las consultas sin WHERE no generan condiciones."""
+        assert self.parser.parse("SELECT * FROM usuarios") == {}
+        assert self.parser.extract_where_clause("INSERT INTO t VALUES (1)") is None
+        assert self.parser.extract_where_clause("SELECT * FROM t\nwhere id = 1") == "id = 1"
+    
+    def test_parse_is_memoized(self):
+        """Prueba que las consultas repetidas reutilizan el análisis sin compartir el resultado."""
+        sql = "SELECT * FROM usuarios WHERE edad > 40 AND rol = 'memo'"
+        first = self.parser.parse(sql)
+        first["edad"]["$gt"] = 0
+        assert self.parser.parse(sql) == {"edad": {"$gt": 40}, "rol": "memo"}
+        assert _parse_where.cache_info().hits >= 1
+    
+    def test_top_level_operators(self):
+        """Prueba que AND/OR dentro de comillas o de un BETWEEN no separan condiciones."""
+        sql = "SELECT * FROM usuarios WHERE edad BETWEEN 20 AND 30 AND nombre = 'Ana OR Eva'"
+        result = self.parser.parse(sql)
+        assert result == {"edad": {"$gte": 20, "$lte": 30}, "nombre": "Ana OR Eva"}
+        
+        assert self.parser._split_by_top_level_operator("a = 1\nAND (b = 2 AND c = 3)", "AND") == [
+            "a = 1", "(b = 2 AND c = 3)"
+        ]
+    
     def test_complex_expressions(self):
         """Prueba para expresiones complejas con paréntesis."""
         sql = "SELECT * FROM usuarios WHERE (edad > 30 AND rol = 'usuario') OR rol = 'admin'"
@@ -214,6 +275,14 @@ class TestWhereParser:
         
         # No hacemos verificaciones más detalladas porque la implementación puede variar
         # Lo importante es que la estructura básica sea correcta ($or con una lista)
+        assert result["$or"] == [{"edad": {"$gt": 30}, "rol": "usuario"}, {"rol": "admin"}]
+        
+        assert self.parser._tokenize_top_level("(a = 1) AND (b = 2)") == ("AND", ["(a = 1)", "(b = 2)"])
+        assert self.parser._tokenize_top_level("((a = 1))") == (None, ["a = 1"])
+        
+        # Anidamiento de OR dentro de AND dentro de OR
+        sql = "SELECT * FROM t WHERE a = 1 OR (b = 2 AND (c = 3 OR d = 4))"
+        assert self.parser.parse(sql) == {"$or": [{"a": 1}, {"b": 2, "$or": [{"c": 3}, {"d": 4}]}]}
     
     def test_where_to_mongodb_translation(self):
         """Prueba la traducción de WHERE a MongoDB."""
@@ -0,0 +1,61 @@
+import pytest
+import sys
+import os
+import logging
+
+# Agregar el directorio raíz al PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.parser.join_parser import JoinParser
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+@pytest.mark.order(6)
+class TestJoinParser:
+    """Pruebas para el parser JOIN."""
+
+    def setup_method(self):
+        """Configuración para cada test."""
+        self.parser = JoinParser()
+
+    def test_validate_join_query(self):
+        """Prueba la validación de consultas con JOINs."""
+        sql = ("SELECT * FROM a "
+               "INNER JOIN b ON a.id = b.a_id "
+               "LEFT JOIN c ON a.id = c.a_id "
+               "RIGHT JOIN d ON a.id = d.a_id "
+               "INNER JOIN e ON a.id = e.a_id")
+        result = self.parser.validate_join_query(sql)
+
+        assert result["is_valid"] is True
+        assert result["join_count"] == 4
+        # Una advertencia por el RIGHT JOIN y una sola por la cantidad de JOINs
+        assert len(result["warnings"]) == 2
+        assert result["warnings"].count("Múltiples JOINs pueden afectar el rendimiento") == 1
+        assert result["complexity_score"] == 4 + 2
+
+    def test_generate_join_explanation(self):
+        """Prueba la explicación generada para los JOINs."""
+        joins = self.parser.parse_joins("SELECT * FROM pedidos p LEFT JOIN clientes c ON p.cliente_id = c.id")
+        result = self.parser.generate_join_explanation(joins)
+
+        assert result["total_joins"] == 1
+        assert result["join_explanations"][0]["explanation"] == \
+            "LEFT JOIN with clientes on p.cliente_id = c.id"
+        assert result["join_explanations"][0]["complexity"] == "simple"
+
+    def test_translate_joins_with_index_hints(self):
+        """Prueba que optimize=True agrega la sugerencia de índice al $lookup."""
+        sql = "SELECT * FROM pedidos p INNER JOIN clientes c ON p.cliente_id = c.id"
+        pipeline = self.parser.translate_joins_to_mongodb(sql, optimize=True)
+
+        assert [list(stage)[0] for stage in pipeline] == ["$lookup", "$match", "$unwind"]
+        assert pipeline[0]["$lookup"]["_index_hint"] == "Consider index on clientes.id"
+
+        # El método de compatibilidad produce el mismo resultado en el lugar
+        plain = self.parser.translate_joins_to_mongodb(sql)
+        assert "_index_hint" not in plain[0]["$lookup"]
+        assert self.parser.optimize_join_pipeline(plain) is plain
+        assert plain == pipeline
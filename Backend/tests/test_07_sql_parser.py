@@ -0,0 +1,192 @@
+import pytest
+import sys
+import os
+import logging
+
+# Agregar el directorio raíz al PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.parser import sql_parser as sql_parser_module
+from app.parser.sql_parser import SQLParser
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+@pytest.mark.order(7)
+class TestSQLParser:
+    """Pruebas para el parser SQL principal."""
+
+    def test_get_table_name(self):
+        """Prueba la extracción del nombre de tabla para cada tipo de consulta."""
+        cases = {
+            "SELECT * FROM usuarios WHERE edad > 18": "usuarios",
+            "SELECT nombre FROM `Clientes`;": "clientes",
+            "INSERT INTO productos (nombre) VALUES ('a')": "productos",
+            "UPDATE usuarios SET edad = 1": "usuarios",
+            "DELETE FROM pedidos WHERE id = 1": "pedidos",
+            "CREATE TABLE ventas (id INT)": "ventas",
+            "CREATE TABLE IF NOT EXISTS ventas (id INT)": "ventas",
+            "DROP TABLE ventas;": "ventas",
+            "SELECT a\nFROM\n  ventas": "ventas",
+            "SELECT * FROM (SELECT id FROM ventas) v": "ventas",
+            "INSERT INTO productos(nombre) VALUES ('a')": "productos",
+        }
+        for sql, expected in cases.items():
+            assert SQLParser(sql).get_table_name() == expected, sql
+        
+        # Los dígitos de un identificador forman parte del nombre de la tabla
+        assert SQLParser("SELECT * FROM `logs-2024`").get_table_name() == "logs-2024"
+        assert SQLParser("SELECT * FROM `logs-2025`").get_table_name() == "logs-2025"
+        assert SQLParser("INSERT INTO `ventas-2023` (a) VALUES (1)").get_table_name() == "ventas-2023"
+        assert SQLParser("UPDATE `app-1` SET a = 2").get_table_name() == "app-1"
+        assert SQLParser("DELETE FROM `t-1` WHERE id = 3").get_table_name() == "t-1"
+        assert SQLParser("DROP TABLE `t-9`").get_table_name() == "t-9"
+
+    def test_get_query_type(self):
+        """Prueba la detección del tipo de consulta."""
+        assert SQLParser("  select * from usuarios").get_query_type() == "SELECT"
+        assert SQLParser("INSERT INTO t VALUES (1)").get_query_type() == "INSERT"
+        assert SQLParser("DROP TABLE t").get_query_type() == "DROP"
+        assert SQLParser("ALTER TABLE t ADD c INT").get_query_type() == "ALTER"
+        assert SQLParser("").get_query_type() is None
+
+        # El camino rápido no necesita ejecutar sqlparse
+        parser = SQLParser("UPDATE t SET a = 1")
+        assert parser.get_query_type() == "UPDATE"
+        assert parser._parsed is None
+        assert parser.get_tokens()
+        assert not hasattr(parser, "__dict__")
+
+    def test_accessors_are_memoized(self):
+        """Prueba que los accesores reutilizan el resultado ya calculado."""
+        parser = SQLParser("SELECT * FROM usuarios LIMIT 5")
+        assert parser.get_limit() == 5
+        assert parser.get_table_name() == "usuarios"
+        assert parser._cache == {"analysis": ("SELECT", "usuarios", 5)}
+
+        other = SQLParser("select *\n  from Usuarios   limit 8")
+        assert other.get_table_name() == "usuarios"
+        assert other.get_limit() == 8
+
+    def test_order_by_and_limit(self):
+        """Prueba ORDER BY y LIMIT al inicio, en medio y al final de la consulta."""
+        parser = SQLParser("SELECT * FROM usuarios ORDER BY edad DESC, nombre LIMIT 10;")
+        assert parser.get_order_by() == {"edad": -1, "nombre": 1}
+        assert parser.get_limit() == 10
+
+        assert SQLParser("SELECT * FROM usuarios LIMIT 3\n").get_limit() == 3
+        assert SQLParser("SELECT * FROM usuarios LIMIT 3x").get_limit() is None
+        assert SQLParser("SELECT * FROM usuarios").get_order_by() == {}
+
+        # Una columna terminada en "from" no se confunde con la cláusula FROM
+        assert SQLParser("SELECT is_from FROM envios").get_table_name() == "envios"
+        assert SQLParser("SELECT * FROM t LIMIT\n  20 ;").get_limit() == 20
+        assert SQLParser("SELECT * FROM t WHERE nota = 'LIMIT' LIMIT 4").get_limit() == 4
+        assert SQLParser("SELECT * FROM t LIMIT 4 OFFSET 2 -- LIMIT").get_limit() == 4
+
+    def test_parse_many(self):
+        """Prueba el análisis por lotes, en el proceso actual y con varios procesos."""
+        queries = [
+            "SELECT * FROM usuarios LIMIT 2",
+            "DELETE FROM pedidos WHERE id = 1",
+            "UPDATE productos SET precio = 10",
+        ]
+        expected = [
+            {"type": "SELECT", "table": "usuarios", "limit": 2},
+            {"type": "DELETE", "table": "pedidos", "limit": None},
+            {"type": "UPDATE", "table": "productos", "limit": None},
+        ]
+        assert SQLParser.parse_many(queries, workers=1) == expected
+        assert SQLParser.parse_many(queries, workers=2) == expected
+        assert SQLParser.parse_many([]) == []
+
+    def test_parse_many_small_batch_in_process(self, monkeypatch):
+        """Prueba que un lote pequeño sin workers no arranca un pool de procesos."""
+        def no_pool(*args, **kwargs):
+            raise AssertionError("no se esperaba un ProcessPoolExecutor")
+        monkeypatch.setattr(sql_parser_module, "ProcessPoolExecutor", no_pool)
+        
+        assert SQLParser.parse_many(["DROP TABLE t", "SELECT * FROM u LIMIT 1"]) == [
+            {"type": "DROP", "table": "t", "limit": None},
+            {"type": "SELECT", "table": "u", "limit": 1},
+        ]
+    
+    def test_feature_analysis(self):
+        """Prueba el análisis de complejidad y de características usadas."""
+        parser = SQLParser("SELECT DISTINCT c.nombre FROM pedidos p "
+                           "INNER JOIN clientes c ON p.cliente_id = c.id WHERE p.total > 10")
+        complexity = parser.analyze_query_complexity()
+        assert complexity["factors"]["has_joins"] is True
+        assert complexity["factors"]["has_distinct"] is True
+        assert complexity["factors"]["has_union"] is False
+        assert complexity["complexity_level"] == "moderate"
+        assert parser.analyze_query_complexity() is complexity
+
+        features = parser.get_all_features_used()
+        assert features["basic_info"]["table_name"] == "pedidos"
+        assert features["basic_info"]["has_where"] is True
+        assert features["advanced_features"]["has_distinct"] is True
+        assert len(features["joins"]["join_list"]) == 1
+
+    def test_having_with_non_ascii_literal(self):
+        """Prueba HAVING con literales cuya longitud cambia al pasar a mayúsculas (ß -> SS)."""
+        parser = SQLParser("SELECT ciudad, COUNT(*) FROM clientes GROUP BY ciudad "
+                           "HAVING ciudad = 'straße' AND COUNT(*) > 2")
+        assert parser.get_having_clause() == {"ciudad": "straße", "count_all": {"$gt": 2}}
+        
+        parser = SQLParser("SELECT a, SUM(b) FROM t GROUP BY a HAVING a = 'ßßß' OR SUM(b) > 2")
+        assert parser.get_having_clause() == {"$or": [{"a": "ßßß"}, {"sum_b": {"$gt": 2}}]}
+    
+    def test_split_columns(self):
+        """Prueba la división de columnas respetando paréntesis y comillas."""
+        parser = SQLParser("CREATE TABLE t (id INT)")
+        columns = parser.split_columns("id INT, precio DECIMAL(10,2), nota VARCHAR(5) DEFAULT 'a,b', ")
+        assert columns == ["id INT", "precio DECIMAL(10,2)", "nota VARCHAR(5) DEFAULT 'a,b'"]
+
+        simple = SQLParser("SELECT upper(nombre), LOG10 (x) FROM t UNION SELECT a FROM b")
+        assert simple.has_functions() is True
+        assert simple.has_union() is True
+        assert simple.has_joins() is False
+        assert simple._cache["features"]["has_distinct"] is False
+
+    def test_parse_order_fields(self):
+        """Prueba el parseo de los campos de ORDER BY."""
+        parser = SQLParser("SELECT * FROM t")
+        assert parser._parse_order_fields("a, b desc ,c ASC;") == {"a": 1, "b": -1, "c": 1}
+        assert parser._parse_order_fields("a FOO, b c d, e") == {"a": 1, "e": 1}
+        assert parser._parse_order_fields("") == {}
+
+    def test_get_create_table_info(self):
+        """Prueba la extracción de columnas y restricciones de CREATE TABLE."""
+        sql = ("CREATE TABLE pedidos (id INT PRIMARY KEY, cliente_id INT NOT NULL, "
+               "total DECIMAL(10,2) DEFAULT 0, "
+               "FOREIGN KEY (cliente_id) REFERENCES clientes(id))")
+        info = SQLParser(sql).get_create_table_info()
+
+        assert info["table_name"] == "pedidos"
+        assert [col["name"] for col in info["columns"]] == ["id", "cliente_id", "total"]
+        assert info["has_primary_key"] is True
+        assert info["columns"][1]["is_not_null"] is True
+        assert info["columns"][2]["mongo_type"] == "number"
+        assert info["columns"][2]["default_value"] == "0"
+        assert info["constraints"]["foreign_keys"] == [{
+            "columns": ["cliente_id"],
+            "referenced_table": "clientes",
+            "referenced_columns": ["id"]
+        }]
+
+        # Definición con IF NOT EXISTS, texto tras el paréntesis de cierre y ')' entre comillas
+        info = SQLParser("CREATE TABLE IF NOT EXISTS notas (id INT, texto VARCHAR(10) DEFAULT ')') ENGINE=InnoDB (x)").get_create_table_info()
+        assert info["original_definition"] == "id INT, texto VARCHAR(10) DEFAULT ')'"
+        assert info["total_columns"] == 2
+
+    def test_map_sql_to_mongo_type(self):
+        """Prueba el mapeo de tipos SQL a tipos MongoDB."""
+        parser = SQLParser("SELECT 1")
+        assert parser.map_sql_to_mongo_type("BIGINT") == "int"
+        assert parser.map_sql_to_mongo_type("varchar(50)") == "string"
+        assert parser.map_sql_to_mongo_type("DECIMAL(10,2)") == "number"
+        assert parser.map_sql_to_mongo_type("BOOLEAN") == "bool"
+        assert parser.map_sql_to_mongo_type("TIMESTAMP") == "date"
+        assert parser.map_sql_to_mongo_type("BLOB") == "mixed"